@@ -0,0 +1,4 @@
+# benchmarks/__main__.py
+from .tree_comparison import main
+
+main()
@@ -0,0 +1,65 @@
+# benchmarks/bulk_build.py
+"""
+bulk_load() with a growing number of worker processes against an insert() loop.
+
+Every run builds a tree from the same random keys (with some duplicates).
+The baseline inserts them one at a time; bulk_load() sorts and deduplicates
+them in worker processes and builds a balanced tree in one pass. Layout is
+deferred with batch() and left out of every timing.
+
+Usage:
+    python -m benchmarks.bulk_build [--size 1000000] [--processes 1 2 4 8]
+"""
+import argparse
+import os
+import random
+import time
+
+from tree_structures.bst import BST
+from tree_structures.avl import AVLTree
+
+
+def _insert_loop(tree_class, keys):
+    tree = tree_class('off')
+    with tree.batch(layout=False):
+        start = time.perf_counter()
+        for key in keys:
+            tree.insert(key)
+        elapsed = time.perf_counter() - start
+    return elapsed
+
+
+def _bulk_load(tree_class, keys, processes):
+    tree = tree_class('off')
+    with tree.batch(layout=False):
+        start = time.perf_counter()
+        tree.bulk_load(keys, processes)
+        elapsed = time.perf_counter() - start
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    keys = [rng.randrange(args.size * 4) for _ in range(args.size)]
+    print(f"{os.cpu_count()} CPUs, {args.size} keys")
+
+    print(f"{'tree':<8}{'method':<16}{'seconds':>10}{'speedup':>9}")
+    for tree_class in (BST, AVLTree):
+        # Random keys keep the plain BST's insert loop at O(n log n)
+        baseline = _insert_loop(tree_class, keys)
+        print(f"{tree_class.__name__:<8}{'insert loop':<16}{baseline:>10.2f}{1:>8.1f}x")
+        for processes in args.processes:
+            elapsed = _bulk_load(tree_class, keys, processes)
+            method = f"bulk_load x{processes}"
+            print(f"{tree_class.__name__:<8}{method:<16}{elapsed:>10.2f}"
+                  f"{baseline / elapsed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
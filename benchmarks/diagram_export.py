@@ -0,0 +1,54 @@
+# benchmarks/diagram_export.py
+"""
+Headless SVG/PostScript export of growing AVL trees.
+
+Each tree is bulk-loaded and laid out, then exported once per format.
+Peak memory during the export is measured with tracemalloc in a separate
+run (tracing slows the export down several times) and should stay flat
+as the tree grows.
+
+Usage:
+    python -m benchmarks.diagram_export [--sizes 1000 10000 100000]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from gui.diagram_export import export_diagram
+from tree_structures.avl import AVLTree
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--formats", nargs="+", choices=["svg", "eps"],
+                        default=["svg", "eps"])
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp()
+    print(f"{'nodes':>8}{'format':>8}{'seconds':>10}{'file':>11}{'peak memory':>14}")
+    try:
+        for size in args.sizes:
+            tree = AVLTree('off')
+            tree.bulk_load(range(size))
+            for extension in args.formats:
+                path = os.path.join(directory, f"tree.{extension}")
+                start = time.perf_counter()
+                export_diagram(tree, path)
+                seconds = time.perf_counter() - start
+                megabytes = os.path.getsize(path) / 2 ** 20
+                tracemalloc.start()
+                export_diagram(tree, path)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                os.remove(path)
+                print(f"{size:>8}{extension:>8}{seconds:>10.2f}{megabytes:>8.1f}MiB"
+                      f"{peak / 1024:>11.1f}KiB")
+    finally:
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
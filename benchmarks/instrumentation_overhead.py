@@ -0,0 +1,70 @@
+# benchmarks/instrumentation_overhead.py
+"""
+Cost of each instrumentation level on insert, find and delete.
+
+The same random workload runs through the public tree methods at every
+level ('off', 'counters', 'full'). Layout is skipped with batch(layout=False)
+so only the operations and their bookkeeping are timed. Overheads are relative to
+'off'.
+
+Usage:
+    python -m benchmarks.instrumentation_overhead [--size 100000] [--repeat 3]
+"""
+import argparse
+import random
+import time
+
+from metrics.performance_metrics import INSTRUMENTATION_LEVELS
+from tree_structures.bst import BST
+from tree_structures.avl import AVLTree
+
+PHASES = ('insert', 'find', 'delete')
+
+
+def _measure(tree_class, level, keys, probes, victims):
+    """Seconds per operation for each phase on one freshly built tree."""
+    tree = tree_class(level)
+    clock = time.perf_counter
+    timings = {}
+    with tree.batch(layout=False):
+        for phase, operation, phase_keys in (('insert', tree.insert, keys),
+                                             ('find', tree.find_path, probes),
+                                             ('delete', tree.delete, victims)):
+            start = clock()
+            for key in phase_keys:
+                operation(key)
+            timings[phase] = (clock() - start) / len(phase_keys)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    keys = rng.sample(range(args.size * 4), args.size)
+    probes = rng.sample(keys, len(keys))
+    victims = probes[:len(keys) // 2]
+
+    print(f"{'tree':<8}{'level':<10}" + "".join(f"{phase:>18}" for phase in PHASES))
+    for tree_class in (BST, AVLTree):
+        baseline = None
+        for level in INSTRUMENTATION_LEVELS:
+            # Best of several runs to keep scheduler noise out
+            best = {phase: float('inf') for phase in PHASES}
+            for _ in range(args.repeat):
+                for phase, seconds in _measure(tree_class, level, keys,
+                                               probes, victims).items():
+                    best[phase] = min(best[phase], seconds)
+            baseline = baseline or best
+            cells = "".join(
+                f"{best[phase] * 1e6:>9.2f}µs{(best[phase] / baseline[phase] - 1) * 100:>+7.1f}%"
+                for phase in PHASES)
+            print(f"{tree_class.__name__:<8}{level:<10}{cells}")
+
+
+if __name__ == "__main__":
+    main()
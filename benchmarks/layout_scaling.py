@@ -0,0 +1,72 @@
+# benchmarks/layout_scaling.py
+"""
+Cost of the tidy tree layout at growing tree sizes.
+
+For each size the tree is built without layout, then timed for one full
+layout pass and for the incremental relayout that follows a single insert
+or delete (the path that runs on every GUI operation).
+
+Usage:
+    python -m benchmarks.layout_scaling [--sizes 1000 10000 100000] [--ops 1000]
+"""
+import argparse
+import random
+import time
+
+from tree_structures.bst import BST
+from tree_structures.avl import AVLTree
+
+
+def _measure(tree_class, size, ops, seed):
+    rng = random.Random(seed)
+    keys = rng.sample(range(size * 4), size)
+    tree = tree_class()
+    for key in keys:
+        tree._insert_iterative(key)
+
+    start = time.perf_counter()
+    tree.layout_engine.update(tree.root, full=True)
+    full_time = time.perf_counter() - start
+
+    # Alternate inserting a fresh key and deleting an existing one so the
+    # tree size stays put while every relayout is a real incremental one
+    present = set(keys)
+    incremental_time = 0.0
+    moved = 0
+    for i in range(ops):
+        if i % 2 == 0:
+            key = rng.randrange(size * 4)
+            while key in present:
+                key = rng.randrange(size * 4)
+            present.add(key)
+            tree._insert_iterative(key)
+        else:
+            key = rng.choice(keys)
+            while key not in present:
+                key = rng.choice(keys)
+            present.discard(key)
+            tree._delete_iterative(key)
+        start = time.perf_counter()
+        moved += len(tree.layout_engine.update(tree.root))
+        incremental_time += time.perf_counter() - start
+
+    return full_time, incremental_time / ops, moved / ops
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--ops", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    print(f"{'tree':<8}{'nodes':>9}{'full':>12}{'per op':>12}{'touched/op':>12}")
+    for size in args.sizes:
+        for tree_class in (BST, AVLTree):
+            full_time, op_time, touched = _measure(tree_class, size, args.ops, args.seed)
+            print(f"{tree_class.__name__:<8}{size:>9}{full_time * 1e3:>10.1f}ms"
+                  f"{op_time * 1e6:>10.1f}µs{touched:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/mutation_latency.py
+"""
+Per-operation insert/delete latency with and without the old contains()
+pre-scan.
+
+The "two-pass" column reproduces the previous behaviour (a contains() walk
+followed by the mutating descent), the "single-pass" column is the current
+one. Layout is left out on purpose: it is the same in both cases and would
+swamp the difference being measured.
+
+Usage:
+    python -m benchmarks.mutation_latency [--sizes 100000 1000000] [--seed 1]
+"""
+import argparse
+import random
+import time
+
+from tree_structures.bst import BST
+from tree_structures.avl import AVLTree
+
+
+def _two_pass_insert(tree, value):
+    if tree.contains(value):
+        return False
+    return tree._insert_iterative(value)
+
+
+def _two_pass_delete(tree, value):
+    if not tree.contains(value):
+        return False
+    return tree._delete_iterative(value)
+
+
+def _run(tree_class, keys, insert, delete):
+    tree = tree_class()
+    start = time.perf_counter()
+    for key in keys:
+        insert(tree, key)
+    insert_time = time.perf_counter() - start
+
+    # Delete in a different order than the keys were inserted
+    delete_keys = list(keys)
+    random.shuffle(delete_keys)
+    start = time.perf_counter()
+    for key in delete_keys:
+        delete(tree, key)
+    delete_time = time.perf_counter() - start
+
+    return insert_time / len(keys), delete_time / len(keys)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    print(f"{'tree':<8}{'keys':>10}{'op':>8}{'two-pass':>12}{'single':>12}{'saved':>8}")
+    for size in args.sizes:
+        random.seed(args.seed)
+        keys = random.sample(range(size * 4), size)
+        for tree_class in (BST, AVLTree):
+            random.seed(args.seed)
+            old = _run(tree_class, keys, _two_pass_insert, _two_pass_delete)
+            random.seed(args.seed)
+            new = _run(tree_class, keys,
+                       lambda t, v: t._insert_iterative(v),
+                       lambda t, v: t._delete_iterative(v))
+            for op, before, after in (("insert", old[0], new[0]),
+                                      ("delete", old[1], new[1])):
+                print(f"{tree_class.__name__:<8}{size:>10}{op:>8}"
+                      f"{before * 1e6:>10.2f}µs{after * 1e6:>10.2f}µs"
+                      f"{(1 - after / before) * 100:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
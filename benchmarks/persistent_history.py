@@ -0,0 +1,105 @@
+# benchmarks/persistent_history.py
+"""
+Cost of keeping a version per operation: PersistentAVLTree against copy().
+
+A tree of --size keys takes --ops random inserts and deletes, keeping
+every intermediate version. The persistent tree copies only the path an
+operation walks; the baseline keeps a full AVLTree.copy() after each
+operation, timed on the first --copy-ops operations only; the copies are
+not laid out. Memory is measured with tracemalloc. Layout is deferred with
+batch() and left out.
+
+Usage:
+    python -m benchmarks.persistent_history [--size 100000] [--ops 10000]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from tree_structures.avl import AVLTree
+from tree_structures.persistent_avl import PersistentAVLTree
+
+
+def _operations(rng, keys, count, size):
+    """Random inserts and deletes, every delete of a key still present."""
+    present = list(keys)
+    members = set(keys)
+    for _ in range(count):
+        if rng.random() < 0.5 or not present:
+            key = rng.randrange(size * 4)
+            if key not in members:
+                members.add(key)
+                present.append(key)
+            yield 'insert', key
+        else:
+            index = rng.randrange(len(present))
+            present[index], present[-1] = present[-1], present[index]
+            key = present.pop()
+            members.discard(key)
+            yield 'delete', key
+
+
+def _build(tree_class, keys):
+    tree = tree_class('off')
+    with tree.batch():
+        tree.bulk_load(keys)
+    return tree
+
+
+def _run(tree, operations, snapshot):
+    """Apply every operation, keeping every version; returns the versions."""
+    versions = []
+    with tree.batch(layout=False):
+        for name, key in operations:
+            getattr(tree, name)(key)
+            if snapshot:
+                versions.append(tree.copy(layout=False))
+    return versions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--ops", type=int, default=10_000)
+    parser.add_argument("--copy-ops", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    keys = rng.sample(range(args.size * 4), args.size)
+    operations = list(_operations(rng, keys, args.ops, args.size))
+
+    print(f"{'method':<22}{'per op':>12}{'memory/op':>14}")
+    for name, tree_class, ops, snapshot in (
+            ('copy() per version', AVLTree, operations[:args.copy_ops], True),
+            ('persistent', PersistentAVLTree, operations, False)):
+        tree = _build(tree_class, keys)
+        start = time.perf_counter()
+        _run(tree, ops, snapshot)
+        seconds = (time.perf_counter() - start) / len(ops)
+        # Measured separately: tracing allocations slows everything down
+        tree = _build(tree_class, keys)
+        tracemalloc.start()
+        versions = _run(tree, ops, snapshot)
+        allocated = tracemalloc.get_traced_memory()[0] / len(ops)
+        tracemalloc.stop()
+        del versions
+        print(f"{name:<22}{seconds * 1e6:>10.1f}µs{allocated / 1024:>11.1f}KiB")
+
+    tree = _build(PersistentAVLTree, keys)
+    with tree.batch(layout=False):
+        _run(tree, operations, False)
+        start = time.perf_counter()
+        for _ in range(1000):
+            tree.checkout(rng.randrange(len(tree.versions)))
+        switch = (time.perf_counter() - start) / 1000
+    start = time.perf_counter()
+    tree.checkout(rng.randrange(len(tree.versions)))
+    relayout = time.perf_counter() - start
+    print(f"{len(tree.versions)} versions; checkout {switch * 1e3:.1f}ms "
+          f"without layout, {relayout * 1e3:.0f}ms with the relayout")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/redraw_after_find.py
+"""
+Time a full redraw of both canvases with a find path highlighted.
+
+This drives the real TreeComparisonVisualizer window, so it needs a display.
+Run it on two checkouts to compare them.
+
+Usage:
+    python -m benchmarks.redraw_after_find [--sizes 1000 5000] [--repeat 5]
+"""
+import argparse
+import random
+import time
+
+from main import TreeComparisonVisualizer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 5_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    app = TreeComparisonVisualizer()
+    app.update()
+    try:
+        print(f"{'nodes':>8}{'path':>6}{'redraw':>12}")
+        for size in args.sizes:
+            rng = random.Random(args.seed)
+            keys = rng.sample(range(size * 4), size)
+            for tree in (app.bst, app.avl):
+                for key in keys:
+                    tree._insert_iterative(key)
+                tree._update_positions()
+
+            # Highlight the longest BST search path, like a find on a deep key
+            target = max(keys[:200], key=lambda k: len(app.bst.find_path(k)))
+            paths = {'bst': app.bst.find_path(target), 'avl': app.avl.find_path(target)}
+
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                app.draw_trees(highlight_paths=paths)
+                app.update_idletasks()
+            elapsed = (time.perf_counter() - start) / args.repeat
+            print(f"{size:>8}{len(paths['bst']):>6}{elapsed * 1e3:>10.1f}ms")
+
+            app.bst = type(app.bst)()
+            app.avl = type(app.avl)()
+    finally:
+        app.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/replay_log.py
+"""
+Replay a saved operation log against fresh trees without a display.
+
+The log is one saved from the GUI (Save Log) or written with --generate,
+which records inserts of --count keys from a workload distribution followed
+by finds and deletes of present keys. Every tree replays the whole log at
+full speed, without layout, then reports its throughput and latency
+percentiles per operation.
+
+Usage:
+    python -m benchmarks.replay_log LOG [--trees bst avl]
+                                        [--instrumentation off|counters|full]
+    python -m benchmarks.replay_log LOG --generate [--count 100000]
+                                        [--distribution zipf]
+"""
+import argparse
+import random
+import time
+
+from metrics.operation_log import OPERATIONS, OperationLog
+from metrics.performance_metrics import INSTRUMENTATION_LEVELS
+from metrics.workloads import DISTRIBUTIONS, generate_keys
+from tree_structures.bst import BST
+from tree_structures.avl import AVLTree
+
+TREES = {'bst': BST, 'avl': AVLTree}
+
+
+def generate_log(count, distribution, seed) -> OperationLog:
+    rng = random.Random(seed)
+    keys = generate_keys(count, 0, count * 4, distribution, rng)
+    log = OperationLog()
+    log.record_many('insert', keys)
+    log.record_many('find', rng.sample(keys, count // 2))
+    log.record_many('delete', rng.sample(keys, count // 4))
+    return log
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("log")
+    parser.add_argument("--trees", nargs="+", choices=list(TREES), default=list(TREES))
+    parser.add_argument("--instrumentation", choices=INSTRUMENTATION_LEVELS,
+                        default='full')
+    parser.add_argument("--generate", action="store_true",
+                        help="write a new log to LOG instead of replaying it")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default='uniform')
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        log = generate_log(args.count, args.distribution, args.seed)
+        log.save(args.log)
+        print(f"wrote {len(log)} operations to {args.log}")
+        return
+
+    log = OperationLog.load(args.log)
+    print(f"{len(log)} operations from {args.log}")
+    print(f"{'tree':<6}{'seconds':>9}{'ops/s':>11}   "
+          + "".join(f"{op + ' p50/p99':>22}" for op in OPERATIONS))
+    for name in args.trees:
+        tree = TREES[name](args.instrumentation)
+        with tree.batch(layout=False):
+            start = time.perf_counter()
+            log.replay(tree)
+            elapsed = time.perf_counter() - start
+        cells = ""
+        for operation in OPERATIONS:
+            p50 = tree.metrics.get_percentile(operation, 50) * 1e6
+            p99 = tree.metrics.get_percentile(operation, 99) * 1e6
+            cells += f"{p50:>11.1f}/{p99:>7.1f}µs"
+        print(f"{name:<6}{elapsed:>9.2f}{len(log) / elapsed:>11.0f}   {cells}")
+
+
+if __name__ == "__main__":
+    main()
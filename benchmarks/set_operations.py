@@ -0,0 +1,78 @@
+# benchmarks/set_operations.py
+"""
+AVLTree union/intersection/difference against one insert() or delete() per key.
+
+A tree of --size keys is combined with trees of each --other-sizes size
+drawn from the same key range, once through the split/join based set
+operation and once through the public insert/delete methods. Both sides run
+inside batch(layout=False), so layout is left out and only the tree
+operations are compared.
+
+Usage:
+    python -m benchmarks.set_operations [--size 200000]
+                                        [--other-sizes 1000 20000 200000]
+"""
+import argparse
+import random
+import time
+
+from tree_structures.avl import AVLTree
+
+
+def _build(keys):
+    tree = AVLTree('counters')
+    tree.insert_many(sorted(keys))
+    return tree
+
+
+def _one_by_one(tree, other, operation):
+    if operation == 'union':
+        for key in other.values():
+            tree.insert(key)
+    elif operation == 'difference':
+        for key in other.values():
+            tree.delete(key)
+    else:
+        for key in list(tree.values()):
+            if not other.contains(key):
+                tree.delete(key)
+
+
+def _timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--other-sizes", type=int, nargs="+",
+                        default=[1_000, 20_000, 200_000])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    universe = range(args.size * 4)
+    keys = rng.sample(universe, args.size)
+
+    print(f"{'operation':<14}{'m':>9}{'per key':>12}{'set op':>12}{'speedup':>9}")
+    for other_size in args.other_sizes:
+        other_keys = rng.sample(universe, other_size)
+        for operation in ('union', 'intersection', 'difference'):
+            results = []
+            for bulk in (False, True):
+                tree, other = _build(keys), _build(other_keys)
+                with tree.batch(layout=False):
+                    if bulk:
+                        run = lambda: getattr(tree, operation)(other)
+                    else:
+                        run = lambda: _one_by_one(tree, other, operation)
+                    results.append(_timed(run))
+            slow, fast = results
+            print(f"{operation:<14}{other_size:>9}{slow * 1e3:>10.1f}ms"
+                  f"{fast * 1e3:>10.1f}ms{slow / fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/snapshot_io.py
+"""
+Saving and loading trees as binary snapshots against rebuilding them.
+
+A BST (random keys) and an AVL tree of --size keys are written to one
+snapshot file and read back. Loading is timed three ways: read_snapshot()
+alone, load_snapshot() without layout, and load_snapshot() with the
+layout pass that Open in the GUI runs before the trees can be drawn.
+The baselines rebuild the same trees from their keys with an insert()
+loop and with bulk_load(); bulk_load gets the keys in order, the way they
+would come out of a text file of values. The rebuilds are timed without
+layout, so compare them with the two load timings that skip it.
+
+Usage:
+    python -m benchmarks.snapshot_io [--size 1000000] [--path trees.snap]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from tree_structures.avl import AVLTree
+from tree_structures.bst import BST
+from tree_structures.snapshot import load_snapshot, read_snapshot, save_snapshot
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def _insert_loop(tree_class, keys):
+    tree = tree_class('off')
+    with tree.batch(layout=False):
+        for key in keys:
+            tree.insert(key)
+    return tree
+
+
+def _bulk_load(tree_class, keys):
+    tree = tree_class('off')
+    with tree.batch(layout=False):
+        tree.bulk_load(keys, processes=1)
+    return tree
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--path", help="snapshot file (default: a temporary file)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    keys = rng.sample(range(args.size * 4), args.size)
+    trees = [_insert_loop(tree_class, keys) for tree_class in (BST, AVLTree)]
+
+    path = args.path or os.path.join(tempfile.mkdtemp(), "trees.snap")
+    try:
+        seconds, _ = _timed(save_snapshot, path, *trees)
+        megabytes = os.path.getsize(path) / 2 ** 20
+        print(f"{'save':<12}{seconds:>8.2f}s  {megabytes:.1f}MiB for two trees")
+        for label, function, extra in (("read", read_snapshot, ()),
+                                      ("load", load_snapshot, ('off', False)),
+                                      ("load+layout", load_snapshot, ('off',))):
+            seconds, loaded = _timed(function, path, *extra)
+            print(f"{label:<12}{seconds:>8.2f}s  ({seconds / 2:.2f}s per tree)")
+            del loaded
+    finally:
+        if not args.path:
+            os.remove(path)
+            os.rmdir(os.path.dirname(path))
+
+    ordered = sorted(keys)
+    print(f"{'tree':<8}{'rebuild':<16}{'seconds':>8}")
+    for tree_class in (BST, AVLTree):
+        seconds, _ = _timed(_insert_loop, tree_class, keys)
+        print(f"{tree_class.__name__:<8}{'insert loop':<16}{seconds:>8.2f}")
+        seconds, _ = _timed(_bulk_load, tree_class, ordered)
+        print(f"{tree_class.__name__:<8}{'bulk_load':<16}{seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# benchmarks/tree_comparison.py
+"""
+Compare BST and AVLTree on insert, find and delete without a display.
+
+For every tree, key order and size the tree is built by inserting every key,
+then timed on random finds and deletes of present keys. Operations go
+through the public insert/find_path/delete methods inside a batch, so the
+tree's own comparison and rotation counters apply and layout runs once per
+phase (reported separately) instead of after every operation. At the
+default 'full' instrumentation level each row also splits the time per
+operation into descent and rebalance.
+
+A plain BST fed sorted or adversarial keys takes quadratic time to build,
+so those runs are skipped above --quadratic-limit keys. 'bst-rebuild' is a
+BST in rebuild (scapegoat) mode; its 'rebuilt' column counts the nodes
+relinked by subtree rebuilds, to set against the AVL tree's rotations.
+
+Usage:
+    python -m benchmarks [--sizes 1000 10000 100000 1000000]
+                         [--orders sorted random zipf adversarial]
+                         [--ops 10000] [--instrumentation off|counters|full]
+                         [--format table|json|csv] [--output FILE]
+"""
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+from functools import partial
+
+from metrics.performance_metrics import INSTRUMENTATION_LEVELS
+from metrics.workloads import generate_keys
+from tree_structures.bst import BST
+from tree_structures.avl import AVLTree
+
+TREES = {'bst': BST,
+         'bst-rebuild': partial(BST, rebuild_alpha=BST.DEFAULT_REBUILD_ALPHA),
+         'avl': AVLTree}
+# Benchmark order name -> workload distribution
+ORDERS = {'sorted': 'sorted', 'random': 'uniform', 'zipf': 'zipf',
+          'adversarial': 'adversarial'}
+# Orders that degenerate an unbalanced BST into a chain
+DEGENERATE_ORDERS = {'sorted', 'adversarial'}
+PERCENTILES = (50, 90, 99, 99.9)
+FIELDS = ['tree', 'order', 'size', 'phase', 'ops', 'seconds', 'ops_per_sec',
+          'p50_us', 'p90_us', 'p99_us', 'p99.9_us', 'max_us',
+          'comparisons_per_op', 'rotations', 'rebuilt', 'height',
+          'descent_us', 'rebalance_us', 'rebuild_us', 'layout_ms']
+# Phases of an operation broken out per row
+OP_PHASES = ('descent', 'rebalance', 'rebuild')
+
+
+def tree_height(root) -> int:
+    """Number of levels, counted without relying on stored node heights."""
+    height = 0
+    level = [root] if root else []
+    while level:
+        height += 1
+        level = [child for node in level for child in (node.left, node.right) if child]
+    return height
+
+
+def percentile(sorted_samples, pct):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(len(sorted_samples) * pct / 100))
+    return sorted_samples[index]
+
+
+def _run_phase(tree, name, operation, keys):
+    """Time operation(key) for every key and summarise one result row."""
+    metrics = tree.metrics
+    comparisons = metrics.comparisons
+    rotations = metrics.rotations
+    rebuilt = metrics.rebuilt_nodes
+    phase_totals = {phase: metrics.phase_times[phase].total for phase in OP_PHASES}
+    clock = time.perf_counter
+    latencies = []
+    record = latencies.append
+
+    start = clock()
+    with tree.batch():
+        for key in keys:
+            op_start = clock()
+            operation(key)
+            record(clock() - op_start)
+        elapsed = clock() - start
+        layout_start = clock()
+    layout = clock() - layout_start
+
+    latencies.sort()
+    ops = len(keys)
+    row = {
+        'phase': name,
+        'ops': ops,
+        'seconds': elapsed,
+        'ops_per_sec': ops / elapsed if elapsed else 0.0,
+        'max_us': (latencies[-1] if latencies else 0.0) * 1e6,
+        'comparisons_per_op': (metrics.comparisons - comparisons) / ops if ops else 0.0,
+        'rotations': metrics.rotations - rotations,
+        'rebuilt': metrics.rebuilt_nodes - rebuilt,
+        'height': tree_height(tree.root),
+        'layout_ms': layout * 1e3,
+    }
+    for phase in OP_PHASES:
+        spent = metrics.phase_times[phase].total - phase_totals[phase]
+        row[f'{phase}_us'] = spent / ops * 1e6 if ops else 0.0
+    for pct in PERCENTILES:
+        row[f'p{pct:g}_us'] = percentile(latencies, pct) * 1e6
+    return row
+
+
+def run_case(tree_name, order, size, ops, seed, instrumentation='full'):
+    """Build one tree and run the insert, find and delete phases on it."""
+    rng = random.Random(seed)
+    keys = generate_keys(size, 0, size * 4, ORDERS[order], rng)
+    tree = TREES[tree_name](instrumentation)
+    probes = rng.sample(keys, min(ops, size))
+    victims = rng.sample(keys, min(ops, size))
+
+    rows = [_run_phase(tree, 'insert', tree.insert, keys),
+            _run_phase(tree, 'find', tree.find_path, probes),
+            _run_phase(tree, 'delete', tree.delete, victims)]
+    for row in rows:
+        row.update(tree=tree_name, order=order, size=size)
+    return rows
+
+
+def write_rows(rows, fmt, out):
+    if fmt == 'json':
+        json.dump(rows, out, indent=2)
+        out.write('\n')
+    elif fmt == 'csv':
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        out.write(f"{'tree':<12}{'order':<12}{'size':>9} {'phase':<7}"
+                  f"{'ops/s':>11}{'p50':>9}{'p99':>9}{'max':>10}"
+                  f"{'cmp/op':>8}{'rot':>9}{'rebuilt':>9}{'height':>8}{'descent':>10}"
+                  f"{'rebal':>9}{'rebuild':>9}{'layout':>10}\n")
+        for row in rows:
+            out.write(f"{row['tree']:<12}{row['order']:<12}{row['size']:>9} "
+                      f"{row['phase']:<7}{row['ops_per_sec']:>11.0f}"
+                      f"{row['p50_us']:>7.1f}µs{row['p99_us']:>7.1f}µs"
+                      f"{row['max_us']:>8.0f}µs{row['comparisons_per_op']:>8.1f}"
+                      f"{row['rotations']:>9}{row['rebuilt']:>9}{row['height']:>8}"
+                      f"{row['descent_us']:>8.1f}µs{row['rebalance_us']:>7.1f}µs"
+                      f"{row['rebuild_us']:>7.1f}µs{row['layout_ms']:>8.0f}ms\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--trees", nargs="+", choices=list(TREES), default=list(TREES))
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--orders", nargs="+", choices=list(ORDERS), default=list(ORDERS))
+    parser.add_argument("--ops", type=int, default=10_000,
+                        help="finds and deletes per case (at most the tree size)")
+    parser.add_argument("--quadratic-limit", type=int, default=10_000,
+                        help="largest degenerate BST case to run")
+    parser.add_argument("--instrumentation", choices=INSTRUMENTATION_LEVELS,
+                        default='full',
+                        help="'counters' or 'off' time the bare operations")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--format", choices=['table', 'json', 'csv'], default='table')
+    parser.add_argument("--output", help="write results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for size in args.sizes:
+        for order in args.orders:
+            for tree_name in args.trees:
+                if (tree_name == 'bst' and order in DEGENERATE_ORDERS
+                        and size > args.quadratic_limit):
+                    print(f"skipping {tree_name} {order} {size}: quadratic",
+                          file=sys.stderr)
+                    continue
+                print(f"running {tree_name} {order} {size}", file=sys.stderr)
+                rows.extend(run_case(tree_name, order, size, args.ops, args.seed,
+                                     args.instrumentation))
+
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as out:
+            write_rows(rows, args.format, out)
+    else:
+        write_rows(rows, args.format, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# gui/diagram_export.py
+"""
+SVG and PostScript diagrams of a laid-out tree, written without Tk.
+
+The tree is walked once with an explicit stack and every node is written
+to the file as soon as it is visited, using the positions of the last
+layout pass and the colours of TreeVisualizerStyles. Nothing is kept per
+node, so memory stays at O(height) and a tree far too big for the canvas
+can be exported headless.
+
+Edges are cut off at the node circles, so the order nodes and edges are
+written in doesn't matter and no second pass is needed to draw the edges
+underneath.
+"""
+import math
+import os
+
+from tree_structures.avl import AVLTree
+from .styles import TreeVisualizerStyles as Styles
+
+MARGIN = 20
+FORMATS = {'.svg': 'svg', '.ps': 'postscript', '.eps': 'postscript'}
+
+
+def export_diagram(tree, path) -> None:
+    """
+    Write a diagram of the tree, as SVG or PostScript depending on the
+    extension of `path` (.svg, .ps or .eps).
+
+    Raises:
+        ValueError: Unknown extension, or the tree has not been laid out
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"can't export a diagram as {extension or path!r}; "
+                         f"use one of {', '.join(FORMATS)}")
+    write = write_svg if FORMATS[extension] == 'svg' else write_postscript
+    with open(path, 'w', encoding='utf-8', newline='\n') as out:
+        write(tree, out)
+
+
+def write_svg(tree, out) -> None:
+    """Stream an SVG diagram of the tree to a text file object."""
+    is_avl, palette, width, height, nodes = _diagram(tree)
+    out.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+              f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" '
+              f'height="{height:.0f}" viewBox="0 0 {width:.0f} {height:.0f}">\n'
+              '<style>\n'
+              f'line {{ stroke: {Styles.EDGE_COLOR}; stroke-width: 2 }}\n'
+              'circle { stroke-width: 2 }\n'
+              f'text {{ font: {_css_font(Styles.NODE_FONT)}; text-anchor: middle; '
+              'dominant-baseline: central; fill: #000000 }\n'
+              f'text.h {{ font: {_css_font(Styles.NORMAL_FONT)} }}\n')
+    # One class per node colour instead of repeating them on every circle
+    for index, (fill, border) in enumerate(palette):
+        out.write(f'.c{index} {{ fill: {fill}; stroke: {border} }}\n')
+    out.write('</style>\n'
+              f'<rect width="100%" height="100%" fill="{Styles.CANVAS_COLOR}"/>\n')
+
+    radius = tree.node_radius
+    write = out.write
+    for x, y, edges, value, node_height, color in nodes:
+        for x1, y1, x2, y2 in edges:
+            write(f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}"/>\n')
+        write(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{radius}" class="c{color}"/>\n')
+        if is_avl:
+            write(f'<text x="{x:.1f}" y="{y - 5:.1f}">{value}</text>'
+                  f'<text class="h" x="{x:.1f}" y="{y + 15:.1f}">h={node_height}</text>\n')
+        else:
+            write(f'<text x="{x:.1f}" y="{y:.1f}">{value}</text>\n')
+    out.write('</svg>\n')
+
+
+def write_postscript(tree, out) -> None:
+    """Stream an Encapsulated PostScript diagram of the tree to a text file object."""
+    is_avl, palette, width, height, nodes = _diagram(tree)
+    out.write('%!PS-Adobe-3.0 EPSF-3.0\n'
+              f'%%BoundingBox: 0 0 {math.ceil(width)} {math.ceil(height)}\n'
+              '%%Title: Tree diagram\n'
+              '%%EndComments\n'
+              f'/r {tree.node_radius} def\n'
+              f'/edge {{ {_ps_color(Styles.EDGE_COLOR)} setrgbcolor }} def\n'
+              f'/label {_ps_font(Styles.NODE_FONT)} def\n'
+              f'/small {_ps_font(Styles.NORMAL_FONT)} def\n'
+              # x1 y1 x2 y2 E: edge
+              '/E { newpath moveto lineto edge stroke } def\n'
+              # border fill x y N: node circle
+              '/N { newpath r 0 360 arc closepath gsave setrgbcolor fill grestore '
+              'setrgbcolor stroke } def\n'
+              # (text) font x y T: text centred on x, y
+              '/T { moveto setfont 0 setgray dup stringwidth pop 2 div neg '
+              'currentfont /FontMatrix get 3 get -350 mul rmoveto show } def\n'
+              '2 setlinewidth\n'
+              f'{_ps_color(Styles.CANVAS_COLOR)} setrgbcolor '
+              f'0 0 {width:.0f} {height:.0f} rectfill\n')
+    for index, (fill, border) in enumerate(palette):
+        out.write(f'/c{index} {{ {_ps_color(border)} {_ps_color(fill)} }} def\n')
+
+    # PostScript's y axis points up
+    write = out.write
+    for x, y, edges, value, node_height, color in nodes:
+        y = height - y
+        for x1, y1, x2, y2 in edges:
+            write(f'{x1:.1f} {height - y1:.1f} {x2:.1f} {height - y2:.1f} E\n')
+        write(f'c{color} {x:.1f} {y:.1f} N\n')
+        if is_avl:
+            write(f'({value}) label {x:.1f} {y + 5:.1f} T '
+                  f'(h={node_height}) small {x:.1f} {y - 15:.1f} T\n')
+        else:
+            write(f'({value}) label {x:.1f} {y:.1f} T\n')
+    out.write('showpage\n%%EOF\n')
+
+
+def _diagram(tree):
+    """
+    (is_avl, palette, width, height, nodes) for a tree, where nodes lazily
+    yields (x, y, edges, value, height, palette index) in page coordinates.
+    """
+    is_avl = isinstance(tree, AVLTree)
+    if is_avl:
+        palette = [Styles.get_node_colors(True, height)
+                   for height in range(1, len(Styles.AVL_NODE_COLORS) + 1)]
+    else:
+        palette = [Styles.get_node_colors(False)]
+
+    if not tree.root:
+        return is_avl, palette, 2 * MARGIN, 2 * MARGIN, iter(())
+    extent = tree.layout_engine.extent(tree.root)
+    if extent is None:
+        raise ValueError("the tree has not been laid out")
+    min_x, min_y, max_x, max_y = extent
+    pad = MARGIN + tree.node_radius
+    width = max_x - min_x + 2 * pad
+    height = max_y - min_y + 2 * pad
+    return (is_avl, palette, width, height,
+            _nodes(tree.root, pad - min_x, pad - min_y, tree.node_radius, is_avl,
+                   len(palette) - 1))
+
+
+def _nodes(root, dx, dy, radius, is_avl, last_color):
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        x, y = node.x + dx, node.y + dy
+        edges = []
+        for child in (node.left, node.right):
+            if child:
+                stack.append(child)
+                edge = _edge(x, y, child.x + dx, child.y + dy, radius)
+                if edge:
+                    edges.append(edge)
+        color = min(max(node.height - 1, 0), last_color) if is_avl else 0
+        yield x, y, edges, node.value, node.height, color
+
+
+def _edge(x1, y1, x2, y2, radius):
+    """The part of the line between two node centres outside both circles."""
+    length = math.hypot(x2 - x1, y2 - y1)
+    if length <= 2 * radius:
+        return None
+    ux = (x2 - x1) / length * radius
+    uy = (y2 - y1) / length * radius
+    return x1 + ux, y1 + uy, x2 - ux, y2 - uy
+
+
+def _css_font(font) -> str:
+    family, size = font[:2]
+    weight = 'bold ' if 'bold' in font[2:] else ''
+    return f'{weight}{size}px {family}'
+
+
+def _ps_font(font) -> str:
+    family, size = font[:2]
+    name = f'{family}-Bold' if 'bold' in font[2:] else family
+    return f'/{name} findfont {size} scalefont'
+
+
+def _ps_color(color: str) -> str:
+    return ' '.join(f'{int(color[i:i + 2], 16) / 255:.3f}' for i in (1, 3, 5))
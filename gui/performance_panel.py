@@ -1,11 +1,15 @@
 # gui/performance_panel.py
 import tkinter as tk
 from tkinter import ttk
+from metrics.performance_metrics import PerformanceMetrics
+from .sparkline import Sparkline
 from .styles import TreeVisualizerStyles as Styles
 
 class PerformancePanel(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent, style="Panel.TFrame")
+        # Time spent in update_metrics itself, as the 'panel' phase
+        self.metrics = PerformanceMetrics()
         self.setup_ui()
     
     def setup_ui(self):
@@ -27,13 +31,31 @@ class PerformancePanel(ttk.Frame):
         bst_left.pack(side=tk.LEFT, padx=5)
         bst_right = ttk.Frame(bst_frame)
         bst_right.pack(side=tk.LEFT, padx=5)
+        bst_phases = ttk.Frame(bst_frame)
+        bst_phases.pack(side=tk.LEFT, padx=5)
         
         self.bst_labels = {
             'comparisons': self._create_compact_label(bst_left, "#Comp:"),
             'insert_time': self._create_compact_label(bst_left, "Ins:"),
             'find_time': self._create_compact_label(bst_left, "Find:"),
             'delete_time': self._create_compact_label(bst_right, "Del:"),
-            'operations': self._create_compact_label(bst_right, "#Oper:")
+            'operations': self._create_compact_label(bst_right, "#Oper:"),
+            'rebuilt': self._create_compact_label(bst_right, "#Rebuilt:"),
+            'descent': self._create_compact_label(bst_phases, "Desc:"),
+            'rebuild': self._create_compact_label(bst_phases, "Rebuild:"),
+            'layout': self._create_compact_label(bst_phases, "Layout:"),
+            'render': self._create_compact_label(bst_phases, "Render:")
+        }
+        
+        # Recent latency of each operation and nodes rebuilt per operation
+        bst_charts = ttk.Frame(bst_frame)
+        bst_charts.pack(side=tk.LEFT, padx=5)
+        self.bst_charts = {
+            'insert': self._create_sparkline(bst_charts, "Ins:"),
+            'find': self._create_sparkline(bst_charts, "Find:"),
+            'delete': self._create_sparkline(bst_charts, "Del:"),
+            'rebuilt': self._create_sparkline(bst_charts, "#Reb:",
+                                              color=Styles.WARNING_COLOR)
         }
         
         # AVL Metrics
@@ -45,14 +67,36 @@ class PerformancePanel(ttk.Frame):
         avl_left.pack(side=tk.LEFT, padx=5)
         avl_right = ttk.Frame(avl_frame)
         avl_right.pack(side=tk.LEFT, padx=5)
+        avl_phases = ttk.Frame(avl_frame)
+        avl_phases.pack(side=tk.LEFT, padx=5)
         
         self.avl_labels = {
             'comparisons': self._create_compact_label(avl_left, "#Comp:"),
             'rotations': self._create_compact_label(avl_left, "#Rot:"),
             'insert_time': self._create_compact_label(avl_right, "Ins:"),
             'find_time': self._create_compact_label(avl_right, "Find:"),
-            'delete_time': self._create_compact_label(avl_right, "Del:")
+            'delete_time': self._create_compact_label(avl_right, "Del:"),
+            'descent': self._create_compact_label(avl_phases, "Desc:"),
+            'rebalance': self._create_compact_label(avl_phases, "Rebal:"),
+            'layout': self._create_compact_label(avl_phases, "Layout:"),
+            'render': self._create_compact_label(avl_phases, "Render:")
+        }
+        
+        # Recent latency of each operation and rotations per operation
+        avl_charts = ttk.Frame(avl_frame)
+        avl_charts.pack(side=tk.LEFT, padx=5)
+        self.avl_charts = {
+            'insert': self._create_sparkline(avl_charts, "Ins:"),
+            'find': self._create_sparkline(avl_charts, "Find:"),
+            'delete': self._create_sparkline(avl_charts, "Del:"),
+            'rotations': self._create_sparkline(avl_charts, "#Rot:",
+                                                color=Styles.WARNING_COLOR)
         }
+        
+        # Cost of refreshing this panel
+        ui_frame = ttk.LabelFrame(metrics_frame, text="UI")
+        ui_frame.pack(side=tk.LEFT, padx=5, pady=2, fill=tk.Y)
+        self.panel_label = self._create_compact_label(ui_frame, "Panel:")
 
     
     def _create_compact_label(self, parent, text):
@@ -65,7 +109,18 @@ class PerformancePanel(ttk.Frame):
         value.pack(side=tk.LEFT)
         return value
     
+    def _create_sparkline(self, parent, text, color=Styles.SECONDARY_COLOR):
+        frame = ttk.Frame(parent)
+        frame.pack(anchor='w', pady=1)
+        ttk.Label(frame, text=text, style="Metric.TLabel",
+                 width=6).pack(side=tk.LEFT)
+        chart = Sparkline(frame, width=120, height=16, color=color)
+        chart.pack(side=tk.LEFT)
+        return chart
+    
     def update_metrics(self, bst_metrics, avl_metrics):
+        span = self.metrics.start_span()
+        
         # Update BST metrics
         self.bst_labels['comparisons'].config(text=str(bst_metrics.comparisons))
         
@@ -82,6 +137,7 @@ class PerformancePanel(ttk.Frame):
             text=f"{bst_delete_time:.1f}µs")
         self.bst_labels['operations'].config(
             text=str(sum(bst_metrics.operations.values())))
+        self.bst_labels['rebuilt'].config(text=str(bst_metrics.rebuilt_nodes))
         
         # Update AVL metrics
         self.avl_labels['comparisons'].config(text=str(avl_metrics.comparisons))
@@ -96,4 +152,21 @@ class PerformancePanel(ttk.Frame):
         self.avl_labels['find_time'].config(
             text=f"{avl_find_time:.1f}µs")
         self.avl_labels['delete_time'].config(
-            text=f"{avl_delete_time:.1f}µs")
\ No newline at end of file
+            text=f"{avl_delete_time:.1f}µs")
+        
+        # Average time of each phase, in the same units as the operations
+        for labels, metrics in ((self.bst_labels, bst_metrics),
+                                (self.avl_labels, avl_metrics)):
+            for phase in ('descent', 'rebalance', 'rebuild', 'layout', 'render'):
+                if phase in labels:
+                    labels[phase].config(
+                        text=f"{metrics.get_phase_avg_time(phase) * 1_000_000:.1f}µs")
+        
+        for charts, metrics in ((self.bst_charts, bst_metrics),
+                                (self.avl_charts, avl_metrics)):
+            for name, chart in charts.items():
+                chart.update_series(metrics.recent.get(name))
+        
+        self.metrics.end_span('panel', span)
+        self.panel_label.config(
+            text=f"{self.metrics.get_phase_avg_time('panel') * 1_000_000:.1f}µs")
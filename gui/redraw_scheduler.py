@@ -0,0 +1,44 @@
+# gui/redraw_scheduler.py
+import time
+
+
+class RedrawScheduler:
+    """
+    Coalesce redraw requests into at most one frame per frame interval.
+
+    request() only marks the view dirty. The first request after a frame
+    schedules the next one, with after_idle() when a frame interval has
+    already passed and after() for the rest of the interval otherwise, so
+    any number of requests in between cost a single draw.
+
+    The draw callback gets a deadline (a time.perf_counter() value) for the
+    frame and returns False if it had to leave work undone; that work gets
+    its own frame instead of holding up the events queued behind it.
+    """
+    def __init__(self, widget, draw, frame_ms: int = 16, budget_ms: int = 12):
+        self.widget = widget
+        self.draw = draw
+        self.frame_ms = frame_ms
+        self.budget_ms = budget_ms
+        self._job = None
+        self._last_frame = 0.0
+
+    def request(self):
+        if self._job is not None:
+            return
+        wait_ms = self.frame_ms - (time.perf_counter() - self._last_frame) * 1000
+        if wait_ms <= 0:
+            self._job = self.widget.after_idle(self._run)
+        else:
+            self._job = self.widget.after(int(wait_ms) + 1, self._run)
+
+    def cancel(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _run(self):
+        self._job = None
+        self._last_frame = start = time.perf_counter()
+        if not self.draw(start + self.budget_ms / 1000):
+            self.request()
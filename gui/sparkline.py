@@ -0,0 +1,49 @@
+# gui/sparkline.py
+import tkinter as tk
+from .styles import TreeVisualizerStyles as Styles
+
+
+class Sparkline(tk.Canvas):
+    """
+    Small strip chart of a RingBuffer, newest sample on the right.
+
+    The chart is a single line item whose coordinates are replaced when the
+    buffer has new samples, so a refresh costs one canvas call no matter how
+    many samples arrived since the last one.
+    """
+    def __init__(self, parent, width=120, height=24, color=Styles.SECONDARY_COLOR):
+        super().__init__(parent, width=width, height=height,
+                         bg=Styles.CANVAS_COLOR, highlightthickness=0)
+        self.chart_width = width
+        self.chart_height = height
+        self._line = self.create_line(0, height - 1, 0, height - 1,
+                                      fill=color, width=1)
+        # Buffer last drawn and how many samples it had received by then
+        self._buffer = None
+        self._drawn_total = 0
+
+    def update_series(self, buffer) -> None:
+        if buffer is self._buffer and (buffer is None
+                                       or buffer.total == self._drawn_total):
+            return
+        self._buffer = buffer
+        if buffer is None:
+            self.coords(self._line, 0, self.chart_height - 1,
+                        0, self.chart_height - 1)
+            return
+        self._drawn_total = buffer.total
+
+        values = buffer.values()
+        if len(values) < 2:
+            values = values * 2 or [0, 0]
+        peak = max(values) or 1
+        # Always spread the full capacity across the width, so the chart
+        # scrolls instead of stretching while the buffer fills up
+        step = self.chart_width / max(buffer.capacity - 1, 1)
+        start = self.chart_width - step * (len(values) - 1)
+        usable = self.chart_height - 2
+        coords = []
+        for i, value in enumerate(values):
+            coords.append(start + i * step)
+            coords.append(self.chart_height - 1 - value / peak * usable)
+        self.coords(self._line, *coords)
@@ -0,0 +1,102 @@
+# gui/stress_dialog.py
+import tkinter as tk
+from tkinter import ttk, messagebox
+from metrics.operation_log import KEY_MAX, KEY_MIN
+from metrics.workloads import DISTRIBUTIONS, generate_keys
+from .styles import TreeVisualizerStyles as Styles
+
+
+class StressTestConfig:
+    """Parameters of one stress run."""
+    def __init__(self, count: int = 20, low: int = 1, high: int = 100,
+                 distribution: str = 'uniform'):
+        self.count = count
+        self.low = low
+        self.high = high
+        self.distribution = distribution
+
+    def keys(self, rng=None):
+        return generate_keys(self.count, self.low, self.high,
+                             self.distribution, rng)
+
+
+class StressTestDialog(tk.Toplevel):
+    """
+    Modal dialog asking for the key count, key range and distribution.
+
+    After wait_window() returns, `result` holds the chosen StressTestConfig,
+    or None if the dialog was cancelled.
+    """
+    def __init__(self, parent, config: StressTestConfig):
+        super().__init__(parent)
+        self.title("Stress Test")
+        self.configure(bg=Styles.BACKGROUND_COLOR)
+        self.transient(parent)
+        self.resizable(False, False)
+        self.result = None
+
+        form = ttk.Frame(self, style="Panel.TFrame")
+        form.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        self.count_var = tk.StringVar(value=str(config.count))
+        self.low_var = tk.StringVar(value=str(config.low))
+        self.high_var = tk.StringVar(value=str(config.high))
+        self.distribution_var = tk.StringVar(value=config.distribution)
+
+        rows = [("Keys:", self.count_var), ("Min key:", self.low_var),
+                ("Max key:", self.high_var)]
+        for row, (text, var) in enumerate(rows):
+            ttk.Label(form, text=text, style="Metric.TLabel").grid(
+                row=row, column=0, sticky='w')
+            ttk.Entry(form, textvariable=var, width=12,
+                      style="Custom.TEntry").grid(row=row, column=1, pady=2)
+
+        ttk.Label(form, text="Order:", style="Metric.TLabel").grid(
+            row=len(rows), column=0, sticky='w')
+        ttk.Combobox(form, textvariable=self.distribution_var,
+                     values=DISTRIBUTIONS, state='readonly', width=10).grid(
+            row=len(rows), column=1, pady=2)
+
+        buttons = ttk.Frame(form, style="Panel.TFrame")
+        buttons.grid(row=len(rows) + 1, column=0, columnspan=2, pady=(8, 0))
+        ttk.Button(buttons, text="Run", command=self._accept,
+                   style="Success.TButton").pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons, text="Cancel", command=self.destroy,
+                   style="Warning.TButton").pack(side=tk.LEFT, padx=2)
+
+        self.bind('<Return>', lambda e: self._accept())
+        self.bind('<Escape>', lambda e: self.destroy())
+        self.grab_set()
+
+    def _accept(self):
+        try:
+            config = StressTestConfig(int(self.count_var.get()),
+                                      int(self.low_var.get()),
+                                      int(self.high_var.get()),
+                                      self.distribution_var.get())
+        except ValueError:
+            messagebox.showerror("Invalid Input",
+                "Key count and range must be integers!",
+                parent=self)
+            return
+
+        if config.count <= 0:
+            messagebox.showerror("Invalid Input",
+                "Key count must be positive!",
+                parent=self)
+            return
+        if config.low < KEY_MIN or config.high > KEY_MAX:
+            messagebox.showerror("Invalid Input",
+                f"Keys must lie in [{KEY_MIN}, {KEY_MAX}] to fit in the "
+                "operation log!",
+                parent=self)
+            return
+        if config.high < config.low or config.count > config.high - config.low + 1:
+            messagebox.showerror("Invalid Input",
+                f"The range [{config.low}, {config.high}] can't hold "
+                f"{config.count} distinct keys!",
+                parent=self)
+            return
+
+        self.result = config
+        self.destroy()
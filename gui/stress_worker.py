@@ -0,0 +1,82 @@
+# gui/stress_worker.py
+import queue
+import threading
+import time
+
+
+class StressTestWorker(threading.Thread):
+    """
+    Run a stress test on private copies of both trees off the Tk thread.
+
+    The copies start from the metrics of the original trees, so once they
+    replace them the totals, histograms and recent samples still cover
+    everything done before the run.
+
+    The keys come from `config.keys()`, which is called on the worker too,
+    so drawing millions of keys doesn't hold up the UI either.
+
+    The worker never touches a widget. Everything it has to say goes through
+    `updates` as tuples for the UI to pick up with after():
+
+        ('progress', done, total, bst_metrics, avl_metrics)
+        ('done', bst, avl)
+        ('cancelled',)
+        ('error', message)
+
+    The metrics in a progress message are snapshots, so the UI can read them
+    while the worker keeps inserting.
+    """
+    # Minimum time between two progress messages
+    PROGRESS_INTERVAL = 0.1
+
+    def __init__(self, bst, avl, config, updates: queue.Queue):
+        super().__init__(daemon=True)
+        self.bst = bst
+        self.avl = avl
+        self.config = config
+        self.updates = updates
+        # Taken here, on the Tk thread, which may still be recording render
+        # spans into the trees' metrics while the worker runs
+        self._metrics = (bst.metrics.snapshot(), avl.metrics.snapshot())
+        # The generated keys, for the operation log, once run() has them
+        self.values = None
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def run(self):
+        try:
+            values = self.values = self.config.keys()
+            bst = self.bst.copy()
+            avl = self.avl.copy()
+            bst.metrics, avl.metrics = self._metrics
+            total = len(values)
+            last_report = 0.0
+
+            # Both trees are laid out once, on this thread, when the
+            # batches close
+            with bst.batch(), avl.batch():
+                for done, value in enumerate(values, 1):
+                    if self._cancelled.is_set():
+                        break
+                    bst.insert(value)
+                    avl.insert(value)
+
+                    now = time.perf_counter()
+                    if now - last_report >= self.PROGRESS_INTERVAL or done == total:
+                        last_report = now
+                        self.updates.put(('progress', done, total,
+                                          bst.metrics.snapshot(),
+                                          avl.metrics.snapshot()))
+
+            if self._cancelled.is_set():
+                self.updates.put(('cancelled',))
+            else:
+                self.updates.put(('done', bst, avl))
+        except Exception as e:
+            self.updates.put(('error', str(e)))
@@ -1,6 +1,4 @@
 # tree_structures/styles.py
-import tkinter as tk
-from tkinter import ttk
 
 class TreeVisualizerStyles:
     # Color scheme
@@ -17,6 +15,7 @@ class TreeVisualizerStyles:
     FOUND_NODE_FILL = "#4CAF50"
     FOUND_NODE_BORDER = "#2E7D32"
     PATH_NODE_FILL = "#FFE0B2"
+    SUBTREE_FILL = "#D5DBDB"
     
     # AVL Node color gradients
     AVL_NODE_COLORS = [
@@ -40,6 +39,8 @@ class TreeVisualizerStyles:
 
     @classmethod
     def apply_styles(cls):
+        # Imported here so the colours can be used without a display
+        from tkinter import ttk
         style = ttk.Style()
         
         # Configure the main application style
@@ -0,0 +1,441 @@
+# gui/tree_renderer.py
+from collections import deque
+import time
+from .styles import TreeVisualizerStyles as Styles
+
+
+class _NodeItems:
+    """Canvas items drawn for one node and the state they were drawn with."""
+    __slots__ = ('oval', 'label', 'height_label', 'left_edge', 'right_edge',
+                 'x', 'y', 'value', 'height', 'highlight')
+
+    def __init__(self):
+        self.oval = self.label = self.height_label = None
+        # Edges are stored as (item id, child, drawn-with key)
+        self.left_edge = self.right_edge = None
+        self.x = self.y = self.value = self.height = self.highlight = None
+
+
+class TreeRenderer:
+    """
+    Tree drawing for one canvas, in one of two modes.
+
+    Detail mode is retained: canvas items are kept per node between frames.
+    After the first frame only the nodes reported by the tree's change
+    journal (plus any whose highlight changed) are revisited, and only the
+    items whose drawn state differs get a coords/itemconfig call. Items live
+    in screen coordinates; when the view transform changes they are rescaled
+    in one canvas call.
+
+    Overview mode takes over once the tree is too big or too zoomed out for
+    individual nodes to be readable. Each frame it redraws only what falls
+    inside the canvas, collapses subtrees that are small on screen into a
+    single glyph labelled with their size and height, and stops expanding
+    nodes after a fixed budget, so frame time does not grow with the tree.
+
+    Detail mode can also be drawn against a deadline: nodes that don't get
+    redrawn in time stay dirty, and the next refresh() picks them up.
+    """
+    MARGIN = 40
+    DETAIL_NODE_LIMIT = 1000
+    # Node radius on screen (px) below which the tree is drawn as overview
+    MIN_DETAIL_RADIUS = 6
+    # Subtrees smaller than this on screen (px) are drawn as one glyph
+    COLLAPSE_SIZE = 40
+    MAX_OVERVIEW_NODES = 1500
+    ZOOM_STEP = 1.25
+    # Nodes drawn between two deadline checks
+    DEADLINE_STRIDE = 32
+
+    def __init__(self, canvas, title, is_avl=False, request_redraw=None):
+        self.canvas = canvas
+        # Resizes, zooms and pans go through this, so an owner that paces
+        # its frames can coalesce them; by default they redraw right away
+        self.request_redraw = request_redraw or self.refresh
+        self.is_avl = is_avl
+        self.tree = None
+        self.mode = None
+        self.items = {}
+        self.highlight_path = []
+        self.highlight_nodes = None
+        self.highlighted = set()
+        self.target = None
+        # Nodes waiting to be redrawn or deleted in detail mode
+        self.dirty = set()
+        self.removed = set()
+        # World to screen transform: screen = world * scale + offset
+        self.scale = 1.0
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        # User zoom and pan applied on top of the fit-to-canvas transform
+        self.zoom = 1.0
+        self.pan_x = 0.0
+        self.pan_y = 0.0
+        self._drag_start = None
+
+        canvas.create_text(20, 20, text=title, font=Styles.HEADER_FONT,
+                           anchor="w", tags="title")
+        canvas.bind("<Configure>", lambda e: self.request_redraw(), add="+")
+        canvas.bind("<MouseWheel>",
+                    lambda e: self._zoom_at(e.x, e.y, self.ZOOM_STEP if e.delta > 0
+                                            else 1 / self.ZOOM_STEP))
+        canvas.bind("<Button-4>", lambda e: self._zoom_at(e.x, e.y, self.ZOOM_STEP))
+        canvas.bind("<Button-5>", lambda e: self._zoom_at(e.x, e.y, 1 / self.ZOOM_STEP))
+        canvas.bind("<ButtonPress-1>", self._start_drag)
+        canvas.bind("<B1-Motion>", self._drag)
+        canvas.bind("<Double-Button-1>", lambda e: self.reset_view())
+
+    def render(self, tree, highlight_path=None, deadline=None,
+               highlight_nodes=None) -> bool:
+        """
+        Pick up the tree's changes and the highlighted path, then refresh().
+
+        Args:
+            highlight_path: Search path; its last node is drawn as the target
+            highlight_nodes: Set of further nodes to highlight, such as a
+                             key range. Pass the same set object again to
+                             keep it without comparing its contents.
+
+        Returns:
+            bool: False if the deadline (a time.perf_counter() value) passed
+                  before every dirty node was redrawn
+        """
+        highlight_path = highlight_path or []
+
+        if tree is not self.tree:
+            self._attach(tree)
+        else:
+            self.dirty.update(tree.changed_nodes)
+            tree.changed_nodes = set()
+            self.removed.update(tree.removed_nodes)
+            tree.removed_nodes = []
+
+        # Every node highlighted before or now is redrawn, so each parent
+        # also refreshes the colour of the edge to its child
+        if (highlight_path != self.highlight_path
+                or highlight_nodes is not self.highlight_nodes):
+            highlighted = set(highlight_path)
+            if highlight_nodes:
+                highlighted.update(highlight_nodes)
+            self.dirty.update(self.highlighted)
+            self.dirty.update(highlighted)
+            self.highlighted = highlighted
+            self.highlight_path = list(highlight_path)
+            self.highlight_nodes = highlight_nodes
+            self.target = highlight_path[-1] if highlight_path else None
+
+        return self.refresh(deadline)
+
+    def refresh(self, deadline=None) -> bool:
+        """Redraw after a tree change or a change of canvas size, zoom or pan."""
+        tree = self.tree
+        if tree is None:
+            return True
+        with tree.metrics.span('render'):
+            return self._refresh(tree, deadline)
+
+    def _refresh(self, tree, deadline):
+        view = self._view_transform()
+        if view is None:
+            self._clear()
+            self.dirty, self.removed = set(), set()
+            return True
+        scale, offset_x, offset_y = view
+
+        if (tree.root.layout.size > self.DETAIL_NODE_LIMIT
+                or tree.node_radius * scale < self.MIN_DETAIL_RADIUS):
+            self._clear()
+            self.mode = 'overview'
+            self.scale, self.offset_x, self.offset_y = view
+            self._draw_overview()
+            self.dirty, self.removed = set(), set()
+            return True
+
+        if self.mode != 'detail':
+            self._clear()
+            self.mode = 'detail'
+            self.scale, self.offset_x, self.offset_y = view
+            self.dirty = set(self._all_nodes(tree.root))
+        else:
+            for node in self.removed:
+                self._delete_items(node)
+            self._apply_transform(scale, offset_x, offset_y)
+            self.dirty -= self.removed
+        self.removed = set()
+        return self._draw_dirty(deadline)
+
+    def _draw_dirty(self, deadline) -> bool:
+        """Redraw dirty nodes until none are left or the deadline passes."""
+        dirty = self.dirty
+        stride = self.DEADLINE_STRIDE
+        drawn = 0
+        while dirty:
+            self._draw_node(dirty.pop())
+            drawn += 1
+            if (deadline is not None and drawn % stride == 0
+                    and time.perf_counter() >= deadline):
+                return not dirty
+        return True
+
+    def reset_view(self):
+        self.zoom = 1.0
+        self.pan_x = self.pan_y = 0.0
+        self.request_redraw()
+
+    def _zoom_at(self, x, y, factor):
+        # Keep the point under the cursor where it is
+        self.zoom *= factor
+        self.pan_x = x - (x - self.pan_x) * factor
+        self.pan_y = y - (y - self.pan_y) * factor
+        self.request_redraw()
+
+    def _start_drag(self, event):
+        self._drag_start = (event.x, event.y)
+
+    def _drag(self, event):
+        if self._drag_start is None:
+            return
+        self.pan_x += event.x - self._drag_start[0]
+        self.pan_y += event.y - self._drag_start[1]
+        self._drag_start = (event.x, event.y)
+        self.request_redraw()
+
+    def _attach(self, tree):
+        """Start over with a new tree."""
+        if self.tree is not None:
+            self.tree.track_changes = False
+        self._clear()
+        self.highlight_path = []
+        self.highlight_nodes = None
+        self.highlighted = set()
+        self.target = None
+        self.dirty, self.removed = set(), set()
+        self.zoom = 1.0
+        self.pan_x = self.pan_y = 0.0
+
+        self.tree = tree
+        tree.track_changes = True
+        tree.changed_nodes = set()
+        tree.removed_nodes = []
+
+    def _clear(self):
+        self.canvas.delete("tree")
+        self.items = {}
+        self.mode = None
+
+    @staticmethod
+    def _all_nodes(root):
+        nodes = []
+        stack = [root] if root else []
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            if node.left:
+                stack.append(node.left)
+            if node.right:
+                stack.append(node.right)
+        return nodes
+
+    def _view_transform(self):
+        tree = self.tree
+        if not tree.root:
+            return None
+        extent = tree.layout_engine.extent(tree.root)
+        if extent is None:
+            return None
+        min_x, min_y, max_x, max_y = extent
+        radius = tree.node_radius
+        canvas_width = self.canvas.winfo_width()
+        canvas_height = self.canvas.winfo_height()
+        width = max(canvas_width - 2 * self.MARGIN, 1)
+        height = max(canvas_height - 2 * self.MARGIN, 1)
+
+        # Shrink to fit but never enlarge past the natural node size
+        scale = min(1.0, width / (max_x - min_x + 2 * radius),
+                    height / (max_y - min_y + 2 * radius))
+        offset_x = canvas_width / 2 - (min_x + max_x) / 2 * scale
+        offset_y = canvas_height / 2 - (min_y + max_y) / 2 * scale
+        return (scale * self.zoom,
+                offset_x * self.zoom + self.pan_x,
+                offset_y * self.zoom + self.pan_y)
+
+    def _apply_transform(self, scale, offset_x, offset_y):
+        """Move the retained items from the current transform to a new one."""
+        if (scale, offset_x, offset_y) == (self.scale, self.offset_x, self.offset_y):
+            return
+        ratio = scale / self.scale
+        if ratio != 1.0:
+            self.canvas.scale("tree", 0, 0, ratio, ratio)
+        self.canvas.move("tree", offset_x - self.offset_x * ratio,
+                         offset_y - self.offset_y * ratio)
+        self.scale, self.offset_x, self.offset_y = scale, offset_x, offset_y
+
+    def _delete_items(self, node):
+        items = self.items.pop(node, None)
+        if items is None:
+            return
+        for item in (items.oval, items.label, items.height_label):
+            if item is not None:
+                self.canvas.delete(item)
+        for edge in (items.left_edge, items.right_edge):
+            if edge is not None:
+                self.canvas.delete(edge[0])
+
+    def _highlight_of(self, node):
+        if node is self.target:
+            return 'target'
+        if node in self.highlighted:
+            return 'path'
+        return None
+
+    def _node_colors(self, node, highlight):
+        """Fill, border and text colours for a node."""
+        if highlight == 'target':
+            return Styles.FOUND_NODE_FILL, Styles.FOUND_NODE_BORDER, "#FFFFFF"
+        if highlight == 'path':
+            return Styles.PATH_NODE_FILL, Styles.HIGHLIGHT_PATH_COLOR, "#000000"
+        fill_color, border_color = Styles.get_node_colors(
+            self.is_avl, node.height if self.is_avl else 1)
+        return fill_color, border_color, "#000000"
+
+    def _draw_node(self, node):
+        canvas = self.canvas
+        scale = self.scale
+        x = node.x * scale + self.offset_x
+        y = node.y * scale + self.offset_y
+        radius = self.tree.node_radius * scale
+
+        highlight = self._highlight_of(node)
+
+        items = self.items.get(node)
+        created = items is None
+        if created:
+            items = _NodeItems()
+            self.items[node] = items
+            items.oval = canvas.create_oval(x - radius, y - radius,
+                                            x + radius, y + radius,
+                                            tags=("tree", "node"))
+            if self.is_avl:
+                items.height_label = canvas.create_text(
+                    x, y + 15 * scale, font=Styles.NORMAL_FONT, tags="tree")
+            items.label = canvas.create_text(
+                x, y - (5 * scale if self.is_avl else 0),
+                font=Styles.NODE_FONT, tags="tree")
+        elif items.x != node.x or items.y != node.y:
+            canvas.coords(items.oval, x - radius, y - radius, x + radius, y + radius)
+            canvas.coords(items.label, x, y - (5 * scale if self.is_avl else 0))
+            if self.is_avl:
+                canvas.coords(items.height_label, x, y + 15 * scale)
+
+        if created or items.highlight != highlight or (
+                self.is_avl and items.height != node.height):
+            fill_color, border_color, text_color = self._node_colors(node, highlight)
+            canvas.itemconfig(items.oval, fill=fill_color, outline=border_color,
+                              width=3 if highlight else 2)
+            canvas.itemconfig(items.label, fill=text_color)
+            if self.is_avl:
+                canvas.itemconfig(items.height_label, fill=text_color,
+                                  text=f"h={node.height}")
+
+        if items.value != node.value:
+            canvas.itemconfig(items.label, text=str(node.value))
+
+        items.x, items.y = node.x, node.y
+        items.value, items.height, items.highlight = node.value, node.height, highlight
+
+        items.left_edge = self._draw_edge(items.left_edge, node, node.left, x, y)
+        items.right_edge = self._draw_edge(items.right_edge, node, node.right, x, y)
+
+    def _draw_edge(self, edge, node, child, x, y):
+        if child is None:
+            if edge is not None:
+                self.canvas.delete(edge[0])
+            return None
+
+        is_path_edge = node in self.highlighted and child in self.highlighted
+        key = (node.x, node.y, child.x, child.y, is_path_edge)
+        if edge is not None and edge[1] is child and edge[2] == key:
+            return edge
+
+        child_x = child.x * self.scale + self.offset_x
+        child_y = child.y * self.scale + self.offset_y
+        color = Styles.HIGHLIGHT_PATH_COLOR if is_path_edge else Styles.EDGE_COLOR
+        if edge is None:
+            item = self.canvas.create_line(x, y, child_x, child_y, tags="tree")
+            # Keep edges underneath the node circles
+            self.canvas.tag_lower(item)
+        else:
+            item = edge[0]
+            self.canvas.coords(item, x, y, child_x, child_y)
+        self.canvas.itemconfig(item, width=3 if is_path_edge else 2, fill=color)
+        return (item, child, key)
+
+    def _draw_overview(self):
+        canvas = self.canvas
+        tree = self.tree
+        scale, offset_x, offset_y = self.scale, self.offset_x, self.offset_y
+        canvas_width = canvas.winfo_width()
+        canvas_height = canvas.winfo_height()
+        radius = tree.node_radius * scale
+        level_height = tree.layout_engine.vertical_spacing * scale
+        budget = self.MAX_OVERVIEW_NODES
+
+        # Breadth-first, so running out of budget collapses the deepest
+        # subtrees first
+        queue = deque([(tree.root, None)])
+        while queue:
+            node, parent = queue.popleft()
+            info = node.layout
+            x = node.x * scale + offset_x
+            y = node.y * scale + offset_y
+            left = x + info.min_x * scale - radius
+            right = x + info.max_x * scale + radius
+            top = y - radius
+            bottom = y + (info.depth - 1) * level_height + radius
+            if right < 0 or left > canvas_width or bottom < 0 or top > canvas_height:
+                continue
+
+            if parent is not None:
+                is_path_edge = parent in self.highlighted and node in self.highlighted
+                canvas.create_line(parent.x * scale + offset_x, parent.y * scale + offset_y,
+                                   x, y, tags=("tree", "edge"),
+                                   width=3 if is_path_edge else 1,
+                                   fill=(Styles.HIGHLIGHT_PATH_COLOR if is_path_edge
+                                         else Styles.EDGE_COLOR))
+
+            if info.depth > 1 and (budget <= 0 or max(right - left, bottom - top)
+                                   < self.COLLAPSE_SIZE):
+                self._draw_subtree_glyph(node, x, top, left, right, bottom)
+                continue
+
+            budget -= 1
+            highlight = self._highlight_of(node)
+            fill_color, border_color, text_color = self._node_colors(node, highlight)
+            node_radius = max(radius, 2)
+            canvas.create_oval(x - node_radius, y - node_radius,
+                               x + node_radius, y + node_radius,
+                               fill=fill_color, outline=border_color,
+                               width=2 if highlight else 1, tags=("tree", "node"))
+            if radius >= self.MIN_DETAIL_RADIUS:
+                canvas.create_text(x, y, text=str(node.value), font=Styles.NODE_FONT,
+                                   fill=text_color, tags="tree")
+            if node.left:
+                queue.append((node.left, node))
+            if node.right:
+                queue.append((node.right, node))
+
+        canvas.tag_lower("edge")
+
+    def _draw_subtree_glyph(self, node, x, top, left, right, bottom):
+        """Draw a collapsed subtree as a triangle labelled with its size and height."""
+        info = node.layout
+        outline = (Styles.HIGHLIGHT_PATH_COLOR if node in self.highlighted
+                   else Styles.NODE_BORDER)
+        self.canvas.create_polygon(x, top, left, bottom, right, bottom,
+                                   fill=Styles.SUBTREE_FILL, outline=outline,
+                                   tags=("tree", "node"))
+        if right - left >= 40 and bottom - top >= 30:
+            self.canvas.create_text((left + right) / 2, bottom - (bottom - top) / 3,
+                                    text=f"{info.size}\nh={info.depth}",
+                                    font=Styles.NORMAL_FONT, justify="center",
+                                    tags="tree")
@@ -1,13 +1,34 @@
 # main.py
 import tkinter as tk
-from tkinter import ttk, messagebox
-import random
+from tkinter import ttk, messagebox, filedialog
+import os
+import queue
+import re
 from tree_structures.bst import BST
 from tree_structures.avl import AVLTree
+from tree_structures.snapshot import save_snapshot, load_snapshot
+from gui.diagram_export import FORMATS as DIAGRAM_FORMATS, export_diagram
 from gui.performance_panel import PerformancePanel
+from gui.tree_renderer import TreeRenderer
+from gui.redraw_scheduler import RedrawScheduler
+from gui.stress_worker import StressTestWorker
+from gui.stress_dialog import StressTestConfig, StressTestDialog
+from metrics.operation_log import KEY_MAX, KEY_MIN, OperationLog
+from metrics.workloads import free_key
 from gui.styles import TreeVisualizerStyles as Styles
 
 class TreeComparisonVisualizer(tk.Tk):
+    # How often a running stress test is checked for progress
+    STRESS_POLL_MS = 50
+    # At most one redraw per frame, and how much of a frame it may take
+    FRAME_MS = 16
+    FRAME_BUDGET_MS = 12
+    # Pause between two operations when a log is replayed on screen
+    REPLAY_INTERVAL_MS = 150
+    LOG_FILETYPES = [("Operation logs", "*.oplog"), ("All files", "*.*")]
+    SNAPSHOT_FILETYPES = [("Tree snapshots", "*.trees"), ("All files", "*.*")]
+    DIAGRAM_FILETYPES = [("SVG images", "*.svg"), ("PostScript", "*.ps *.eps")]
+
     def __init__(self):
         super().__init__()
         
@@ -51,9 +72,28 @@ class TreeComparisonVisualizer(tk.Tk):
         self.canvas_bst.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=2)
         self.canvas_avl.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=2)
         
+        # Redraws are coalesced into frames; handlers only request them
+        self.highlight_paths = {'bst': None, 'avl': None}
+        self.highlight_nodes = {'bst': None, 'avl': None}
+        self.redraw = RedrawScheduler(self, self._draw_frame,
+                                      self.FRAME_MS, self.FRAME_BUDGET_MS)
+        
+        # Renderers keep the canvas items between redraws
+        self.bst_renderer = TreeRenderer(self.canvas_bst, "Binary Search Tree",
+                                         request_redraw=self.redraw.request)
+        self.avl_renderer = TreeRenderer(self.canvas_avl, "AVL Tree", is_avl=True,
+                                         request_redraw=self.redraw.request)
+        
         # Initialize trees
         self.bst = BST()
         self.avl = AVLTree()
+        
+        # Last stress test settings; Random draws from the same key range
+        self.stress_config = StressTestConfig()
+        
+        # Every operation since the last reset, and a replay in progress
+        self.op_log = OperationLog()
+        self.replay_job = None
 
     def setup_controls(self):
         # Create a more compact control panel
@@ -84,6 +124,14 @@ class TreeComparisonVisualizer(tk.Tk):
         ttk.Button(ops_frame, text="Delete", width=6,
                   command=self.delete_value,
                   style="Operation.TButton").pack(side=tk.LEFT, padx=1)
+        ttk.Button(ops_frame, text="Range", width=6,
+                  command=self.highlight_range,
+                  style="Operation.TButton").pack(side=tk.LEFT, padx=1)
+        
+        # Opt-in scapegoat rebuilds keep the BST from degenerating
+        self.rebuild_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(ops_frame, text="Rebuild BST", variable=self.rebuild_var,
+                        command=self.toggle_bst_rebuild).pack(side=tk.LEFT, padx=4)
         
         # Right side: Additional operations
         right_frame = ttk.Frame(control_container)
@@ -95,109 +143,153 @@ class TreeComparisonVisualizer(tk.Tk):
         ttk.Button(right_frame, text="Stress", width=8,
                   command=self.run_stress_test,
                   style="Success.TButton").pack(side=tk.LEFT, padx=1)
+        ttk.Button(right_frame, text="Save", width=8,
+                  command=self.save_trees,
+                  style="Operation.TButton").pack(side=tk.LEFT, padx=1)
+        ttk.Button(right_frame, text="Open", width=8,
+                  command=self.open_trees,
+                  style="Operation.TButton").pack(side=tk.LEFT, padx=1)
+        ttk.Button(right_frame, text="Export", width=8,
+                  command=self.export_trees,
+                  style="Operation.TButton").pack(side=tk.LEFT, padx=1)
+        ttk.Button(right_frame, text="Save Log", width=8,
+                  command=self.save_log,
+                  style="Operation.TButton").pack(side=tk.LEFT, padx=1)
+        ttk.Button(right_frame, text="Replay", width=8,
+                  command=self.replay_log,
+                  style="Operation.TButton").pack(side=tk.LEFT, padx=1)
         ttk.Button(right_frame, text="Reset", width=8,
                   command=self.reset_trees,
                   style="Warning.TButton").pack(side=tk.LEFT, padx=1)
 
     def insert_value(self):
-        try:
-            value = int(self.value_entry.get())
-            self.value_entry.delete(0, tk.END)
-            
-            bst_success = self.bst.insert(value)
-            avl_success = self.avl.insert(value)
-            
-            if not bst_success or not avl_success:
-                messagebox.showwarning("Duplicate Value", 
-                    f"Value {value} already exists in the tree!",
-                    parent=self)
-            
-            self.draw_trees()
-            self.update_metrics()
-            self.value_entry.focus()
-            
-        except ValueError:
-            messagebox.showerror("Invalid Input", 
-                "Please enter a valid integer!",
+        value = self._entry_value()
+        if value is None:
+            return
+        self.value_entry.delete(0, tk.END)
+        
+        bst_success = self.bst.insert(value)
+        avl_success = self.avl.insert(value)
+        self.op_log.record('insert', value)
+        
+        if not bst_success or not avl_success:
+            messagebox.showwarning("Duplicate Value", 
+                f"Value {value} already exists in the tree!",
                 parent=self)
+        
+        self.schedule_redraw()
+        self.value_entry.focus()
 
     def find_value(self):
-        try:
-            value = int(self.value_entry.get())
-            self.value_entry.delete(0, tk.END)
-            
-            bst_path = self.bst.find_path(value)
-            avl_path = self.avl.find_path(value)
-            
-            self.draw_trees(highlight_paths={'bst': bst_path, 'avl': avl_path})
-            self.update_metrics()
-            
-            if not bst_path or not avl_path:
-                messagebox.showinfo("Find Result", 
-                    f"Value {value} not found in the trees.",
-                    parent=self)
-            
-            self.value_entry.focus()
-            
-        except ValueError:
+        value = self._entry_value()
+        if value is None:
+            return
+        self.value_entry.delete(0, tk.END)
+        
+        bst_path = self.bst.find_path(value)
+        avl_path = self.avl.find_path(value)
+        self.op_log.record('find', value)
+        
+        self.schedule_redraw(highlight_paths={'bst': bst_path, 'avl': avl_path})
+        
+        if not bst_path or not avl_path:
+            messagebox.showinfo("Find Result", 
+                f"Value {value} not found in the trees.",
+                parent=self)
+        
+        self.value_entry.focus()
+
+    def highlight_range(self):
+        # Two integers in any separated form: "10 40", "10,40", "-5..5"
+        bounds = [int(v) for v in re.findall(r'-?\d+', self.value_entry.get())]
+        if len(bounds) != 2:
             messagebox.showerror("Invalid Input", 
-                "Please enter a valid integer!",
+                "Please enter a range as two integers, e.g. 10..40!",
                 parent=self)
+            return
+        self.value_entry.delete(0, tk.END)
+        lo, hi = min(bounds), max(bounds)
+        
+        # The renderers keep these sets as their highlight
+        bst_nodes = set(self.bst.iter_nodes(lo, hi))
+        avl_nodes = set(self.avl.iter_nodes(lo, hi))
+        self.schedule_redraw(highlight_nodes={'bst': bst_nodes, 'avl': avl_nodes})
+        
+        if not bst_nodes:
+            messagebox.showinfo("Range Result", 
+                f"No values in [{lo}, {hi}].",
+                parent=self)
+        self.value_entry.focus()
 
     def delete_value(self):
+        value = self._entry_value()
+        if value is None:
+            return
+        self.value_entry.delete(0, tk.END)
+        
+        bst_success = self.bst.delete(value)
+        avl_success = self.avl.delete(value)
+        self.op_log.record('delete', value)
+        
+        if not bst_success or not avl_success:
+            messagebox.showwarning("Value Not Found", 
+                f"Value {value} not found in the tree!",
+                parent=self)
+        
+        self.schedule_redraw()
+        self.value_entry.focus()
+
+    def _entry_value(self):
+        """The integer in the value entry, or None after showing what is wrong with it."""
         try:
             value = int(self.value_entry.get())
-            self.value_entry.delete(0, tk.END)
-            
-            bst_success = self.bst.delete(value)
-            avl_success = self.avl.delete(value)
-            
-            if not bst_success or not avl_success:
-                messagebox.showwarning("Value Not Found", 
-                    f"Value {value} not found in the tree!",
-                    parent=self)
-            
-            self.draw_trees()
-            self.update_metrics()
-            self.value_entry.focus()
-            
         except ValueError:
             messagebox.showerror("Invalid Input", 
                 "Please enter a valid integer!",
                 parent=self)
+            return None
+        
+        # Every operation goes into the log, which holds 64-bit keys
+        if not KEY_MIN <= value <= KEY_MAX:
+            messagebox.showerror("Invalid Input",
+                f"Values must lie in [{KEY_MIN}, {KEY_MAX}] to fit in the "
+                "operation log!",
+                parent=self)
+            return None
+        return value
 
     def insert_random(self):
-        value = random.randint(1, 100)
-        attempts = 0
-        max_attempts = 100
+        low, high = self.stress_config.low, self.stress_config.high
+        value = free_key(self.bst.contains, self.bst.values, low, high)
         
-        while attempts < max_attempts:
-            if self.bst.insert(value) and self.avl.insert(value):
-                break
-            value = random.randint(1, 100)
-            attempts += 1
-        
-        if attempts >= max_attempts:
+        if value is None:
             messagebox.showwarning("Operation Failed", 
-                "Could not find a unique random value to insert.",
+                f"Every value in [{low}, {high}] is already in the trees.",
                 parent=self)
+            return
         
-        self.draw_trees()
-        self.update_metrics()
-# /////////////////////////
-# In the TreeComparisonVisualizer class, update the run_stress_test method:
+        with self.bst.batch(), self.avl.batch():
+            self.bst.insert(value)
+            self.avl.insert(value)
+        self.op_log.record('insert', value)
+        
+        self.schedule_redraw()
 
     def run_stress_test(self):
-        response = messagebox.askyesno("Confirm Stress Test",
-            "This will insert 20 random values into both trees. Continue?",
-            parent=self)
+        dialog = StressTestDialog(self, self.stress_config)
+        self.wait_window(dialog)
         
-        if not response:
+        if dialog.result is None:
             return
+        config = self.stress_config = dialog.result
         
-        # Reset metrics
-        self.bst.metrics.reset()
-        self.avl.metrics.reset()
+        # The inserts run on copies of both trees in a worker thread, and
+        # the copies replace the trees when it ends. A paced replay would
+        # keep changing the trees while they are copied and its steps
+        # would be lost in the swap, so it stops here
+        self.stop_replay()
+        updates = queue.Queue()
+        worker = StressTestWorker(self.bst, self.avl, config, updates)
         
         # Create progress window
         progress_window = tk.Toplevel(self)
@@ -205,6 +297,7 @@ class TreeComparisonVisualizer(tk.Tk):
         progress_window.geometry("300x150")
         progress_window.transient(self)
         progress_window.grab_set()
+        progress_window.protocol("WM_DELETE_WINDOW", worker.cancel)
         
         # Center progress window
         progress_window.update_idletasks()
@@ -213,66 +306,71 @@ class TreeComparisonVisualizer(tk.Tk):
         progress_window.geometry(f"+{x}+{y}")
         
         # Setup progress bar
-        ttk.Label(progress_window, text="Inserting random values...", 
+        ttk.Label(progress_window,
+                text=f"Inserting {config.count} {config.distribution} values...", 
                 style="Header.TLabel").pack(pady=10)
         progress_var = tk.IntVar()
         progress_bar = ttk.Progressbar(progress_window, length=200, 
                                     mode='determinate', variable=progress_var)
         progress_bar.pack(pady=10)
+        cancel_button = ttk.Button(progress_window, text="Cancel",
+                                   command=worker.cancel,
+                                   style="Warning.TButton")
+        cancel_button.pack(pady=5)
         
-        def update_progress(current, total):
-            progress_var.set((current / total) * 100)
-            progress_window.update()
-        
-        try:
-            # Use a set to track used values
-            used_values = set()
-            total_insertions = 20
-            
-            for i in range(total_insertions):
-                # Generate a new random value that hasn't been used
+        def poll():
+            try:
                 while True:
-                    value = random.randint(1, 100)
-                    if value not in used_values:
-                        break
-                
-                # Add value to used set
-                used_values.add(value)
-                
-                # Insert into both trees
+                    message = updates.get_nowait()
+                    kind = message[0]
+                    if kind == 'progress':
+                        _, done, total, bst_metrics, avl_metrics = message
+                        progress_var.set((done / total) * 100)
+                        self.performance_panel.update_metrics(bst_metrics, avl_metrics)
+                        if done == total:
+                            cancel_button.config(state=tk.DISABLED)
+                    else:
+                        progress_window.destroy()
+                        finish(message)
+                        return
+            except queue.Empty:
+                pass
+            if worker.cancelled:
+                cancel_button.config(state=tk.DISABLED)
+            self.after(self.STRESS_POLL_MS, poll)
+        
+        def finish(message):
+            kind = message[0]
+            if kind == 'done':
+                # Log the keys first: if they can't be logged the trees are
+                # kept as they were, like for an out-of-range single insert
                 try:
-                    self.bst.insert(value)
-                    self.avl.insert(value)
-                    
-                    # Update visualization every 5 operations
-                    if (i + 1) % 5 == 0:
-                        self.draw_trees()
-                        self.update_metrics()
-                    
-                    # Update progress
-                    update_progress(i + 1, total_insertions)
-                    
-                except Exception as e:
-                    print(f"Error inserting value {value}: {str(e)}")
-                    continue
-            
-            # Final update
-            self.draw_trees()
-            self.update_metrics()
-            
-        except Exception as e:
-            messagebox.showerror("Error", 
-                f"An error occurred during stress test: {str(e)}",
-                parent=self)
-        finally:
-            progress_window.destroy()
-        
-        messagebox.showinfo("Stress Test", 
-            "Stress test completed successfully!",
-            parent=self)
-
-
-        # ////////////////////
+                    self.op_log.record_many('insert', worker.values)
+                except ValueError as e:
+                    self.update_metrics()
+                    messagebox.showerror("Error",
+                        f"Stress test discarded, its keys can't be logged: {e}",
+                        parent=self)
+                    return
+                _, self.bst, self.avl = message
+                self.schedule_redraw()
+                messagebox.showinfo("Stress Test", 
+                    "Stress test completed successfully!",
+                    parent=self)
+            else:
+                # The trees were never touched, so their metrics still apply
+                self.update_metrics()
+                if kind == 'cancelled':
+                    messagebox.showinfo("Stress Test",
+                        "Stress test cancelled, the trees are unchanged.",
+                        parent=self)
+                else:
+                    messagebox.showerror("Error", 
+                        f"An error occurred during stress test: {message[1]}",
+                        parent=self)
+        
+        worker.start()
+        self.after(self.STRESS_POLL_MS, poll)
 
     def reset_trees(self):
         response = messagebox.askyesno("Confirm Reset",
@@ -280,109 +378,153 @@ class TreeComparisonVisualizer(tk.Tk):
             parent=self)
         
         if response:
-            self.bst = BST()
-            self.avl = AVLTree()
-            self.draw_trees()
-            self.update_metrics()
+            self._clear_trees()
             messagebox.showinfo("Reset Complete", 
                 "Trees have been reset successfully!",
                 parent=self)
 
-    def draw_tree(self, canvas, tree, highlight_path=None):
-        canvas.delete("all")
+    def toggle_bst_rebuild(self):
+        self.bst.set_rebuild_alpha(self._bst_rebuild_alpha())
+        self.schedule_redraw()
+
+    def _bst_rebuild_alpha(self):
+        return BST.DEFAULT_REBUILD_ALPHA if self.rebuild_var.get() else None
+
+    def _clear_trees(self):
+        self.stop_replay()
+        self.bst = BST(rebuild_alpha=self._bst_rebuild_alpha())
+        self.avl = AVLTree()
+        self.op_log.clear()
+        self.schedule_redraw()
+
+    def save_trees(self):
+        path = filedialog.asksaveasfilename(parent=self, title="Save Trees",
+                                            defaultextension=".trees",
+                                            filetypes=self.SNAPSHOT_FILETYPES)
+        if not path:
+            return
+        try:
+            save_snapshot(path, self.bst, self.avl)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save the trees: {e}",
+                parent=self)
+
+    def open_trees(self):
+        path = filedialog.askopenfilename(parent=self, title="Open Trees",
+                                          filetypes=self.SNAPSHOT_FILETYPES)
+        if not path:
+            return
+        try:
+            trees = load_snapshot(path)
+            if [type(tree) for tree in trees] != [BST, AVLTree]:
+                raise ValueError("it does not hold a BST and an AVL tree")
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not open the trees: {e}",
+                parent=self)
+            return
         
-        title_text = "Binary Search Tree" if isinstance(tree, BST) else "AVL Tree"
-        canvas.create_text(20, 20, text=title_text, 
-                         font=Styles.HEADER_FONT, anchor="w")
+        # The log restarts from the opened trees
+        self.stop_replay()
+        self.bst, self.avl = trees
+        self.bst.set_rebuild_alpha(self._bst_rebuild_alpha())
+        self.op_log.clear()
+        self.schedule_redraw()
+
+    def export_trees(self):
+        path = filedialog.asksaveasfilename(parent=self, title="Export Diagrams",
+                                            defaultextension=".svg",
+                                            filetypes=self.DIAGRAM_FILETYPES)
+        if not path:
+            return
         
-        def draw_node(node, is_avl=False):
-            if not node:
-                return
-            
-            if node.left:
-                is_path_edge = (highlight_path and 
-                              node in highlight_path and 
-                              node.left in highlight_path)
-                edge_color = Styles.HIGHLIGHT_PATH_COLOR if is_path_edge else Styles.EDGE_COLOR
-                edge_width = 3 if is_path_edge else 2
-                
-                canvas.create_line(node.x, node.y, 
-                                 node.left.x, node.left.y,
-                                 width=edge_width, fill=edge_color)
-            
-            if node.right:
-                is_path_edge = (highlight_path and 
-                              node in highlight_path and 
-                              node.right in highlight_path)
-                edge_color = Styles.HIGHLIGHT_PATH_COLOR if is_path_edge else Styles.EDGE_COLOR
-                edge_width = 3 if is_path_edge else 2
-                
-                canvas.create_line(node.x, node.y, 
-                                 node.right.x, node.right.y,
-                                 width=edge_width, fill=edge_color)
-            
-            is_highlight = highlight_path and node in highlight_path
-            is_target = highlight_path and node == highlight_path[-1]
-            
-            if is_target:
-                fill_color = Styles.FOUND_NODE_FILL
-                border_color = Styles.FOUND_NODE_BORDER
-            elif is_highlight:
-                fill_color = Styles.PATH_NODE_FILL
-                border_color = Styles.HIGHLIGHT_PATH_COLOR
-            else:
-                fill_color, border_color = Styles.get_node_colors(is_avl, 
-                                                            node.height if is_avl else 1)
-            
-            canvas.create_oval(node.x - tree.node_radius, 
-                             node.y - tree.node_radius,
-                             node.x + tree.node_radius, 
-                             node.y + tree.node_radius,
-                             fill=fill_color, 
-                             outline=border_color,
-                             width=3 if is_highlight else 2)
-            
-            text_color = "#FFFFFF" if is_target else "#000000"
-            text = str(node.value)
-            if is_avl:
-                canvas.create_text(node.x, node.y + 15,
-                                 text=f"h={node.height}",
-                                 font=Styles.NORMAL_FONT,
-                                 fill=text_color)
-            
-            canvas.create_text(node.x, node.y - (5 if is_avl else 0),
-                             text=text,
-                             font=Styles.NODE_FONT,
-                             fill=text_color)
-            
-            draw_node(node.left, is_avl)
-            draw_node(node.right, is_avl)
-        
-        draw_node(tree.root, isinstance(tree, AVLTree))
-        self._center_tree(canvas)
+        # One file per tree, named after the chosen one
+        stem, extension = os.path.splitext(path)
+        if extension.lower() not in DIAGRAM_FORMATS:
+            stem, extension = path, ".svg"
+        try:
+            export_diagram(self.bst, f"{stem}_bst{extension}")
+            export_diagram(self.avl, f"{stem}_avl{extension}")
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not export the diagrams: {e}",
+                parent=self)
 
-    def _center_tree(self, canvas):
-        bbox = canvas.bbox('all')
-        if bbox:
-            canvas_width = canvas.winfo_width()
-            canvas_height = canvas.winfo_height()
-            if bbox[2] - bbox[0] > 0:
-                scale = min((canvas_width - 80) / (bbox[2] - bbox[0]),
-                          (canvas_height - 80) / (bbox[3] - bbox[1]))
-                canvas.scale('all', bbox[0], bbox[1], scale, scale)
-            
-            bbox = canvas.bbox('all')
-            if bbox:
-                dx = (canvas_width - (bbox[2] + bbox[0])) / 2
-                dy = (canvas_height - (bbox[3] + bbox[1])) / 2
-                canvas.move('all', dx, dy)
+    def save_log(self):
+        path = filedialog.asksaveasfilename(parent=self, title="Save Operation Log",
+                                            defaultextension=".oplog",
+                                            filetypes=self.LOG_FILETYPES)
+        if not path:
+            return
+        try:
+            self.op_log.save(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save the log: {e}",
+                parent=self)
 
-    def draw_trees(self, highlight_paths=None):
-        if highlight_paths is None:
-            highlight_paths = {'bst': None, 'avl': None}
+    def replay_log(self):
+        path = filedialog.askopenfilename(parent=self, title="Replay Operation Log",
+                                          filetypes=self.LOG_FILETYPES)
+        if not path:
+            return
+        try:
+            log = OperationLog.load(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not load the log: {e}",
+                parent=self)
+            return
         
-        self.draw_tree(self.canvas_bst, self.bst, highlight_paths['bst'])
-        self.draw_tree(self.canvas_avl, self.avl, highlight_paths['avl'])
+        if self.bst.root and not messagebox.askyesno("Replay Log",
+                "Replaying starts from empty trees. Clear the current trees?",
+                parent=self):
+            return
+        self._clear_trees()
+        
+        # One operation per step, recorded again as it is applied, so the
+        # log of a finished replay matches the original
+        operations = iter(log)
+        def step():
+            self.replay_job = None
+            for operation, key in operations:
+                self.op_log.record(operation, key)
+                if operation == 'find':
+                    self.schedule_redraw(highlight_paths={
+                        'bst': self.bst.find_path(key),
+                        'avl': self.avl.find_path(key)})
+                else:
+                    getattr(self.bst, operation)(key)
+                    getattr(self.avl, operation)(key)
+                    self.schedule_redraw()
+                self.replay_job = self.after(self.REPLAY_INTERVAL_MS, step)
+                return
+        step()
+
+    def stop_replay(self):
+        if self.replay_job is not None:
+            self.after_cancel(self.replay_job)
+            self.replay_job = None
+
+    def schedule_redraw(self, highlight_paths=None, highlight_nodes=None):
+        """Redraw both trees and the metrics in the next frame."""
+        self._set_highlight(highlight_paths, highlight_nodes)
+        self.redraw.request()
+
+    def draw_trees(self, highlight_paths=None, highlight_nodes=None):
+        """Redraw both trees right away, without a frame budget."""
+        self._set_highlight(highlight_paths, highlight_nodes)
+        self.redraw.cancel()
+        self._draw_frame(None)
+
+    def _set_highlight(self, highlight_paths, highlight_nodes):
+        self.highlight_paths = highlight_paths or {'bst': None, 'avl': None}
+        self.highlight_nodes = highlight_nodes or {'bst': None, 'avl': None}
+
+    def _draw_frame(self, deadline):
+        paths, nodes = self.highlight_paths, self.highlight_nodes
+        complete = self.bst_renderer.render(self.bst, paths['bst'], deadline,
+                                            nodes['bst'])
+        complete = self.avl_renderer.render(self.avl, paths['avl'], deadline,
+                                            nodes['avl']) and complete
+        self.update_metrics()
+        return complete
 
     def update_metrics(self):
         self.performance_panel.update_metrics(self.bst.metrics, self.avl.metrics)
@@ -394,7 +536,13 @@ if __name__ == "__main__":
     app.bind('<Delete>', lambda e: app.delete_value())
     app.bind('<Control-r>', lambda e: app.insert_random())
     app.bind('<Control-f>', lambda e: app.find_value())
+    app.bind('<Control-g>', lambda e: app.highlight_range())
     app.bind('<Control-t>', lambda e: app.run_stress_test())
+    app.bind('<Control-s>', lambda e: app.save_log())
+    app.bind('<Control-S>', lambda e: app.save_trees())
+    app.bind('<Control-O>', lambda e: app.open_trees())
+    app.bind('<Control-e>', lambda e: app.export_trees())
+    app.bind('<Control-o>', lambda e: app.replay_log())
     app.bind('<Escape>', lambda e: app.reset_trees())
     
     # Give initial focus to entry
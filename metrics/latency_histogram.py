@@ -0,0 +1,95 @@
+# metrics/latency_histogram.py
+"""
+Fixed-size latency histogram with logarithmic buckets (HDR-style).
+
+Durations are recorded in nanoseconds. Values below 2**(SUB_BUCKET_BITS + 1)
+get one bucket each; above that every power of two is split into
+2**SUB_BUCKET_BITS equal buckets, so a bucket is never wider than about 3%
+of the values in it. Recording is O(1) and the memory use is fixed no
+matter how many samples come in.
+
+Samples beyond the last bucket are counted in `overflow` instead of being
+put into the last bucket, so a percentile that lands among them comes out
+as the exact maximum rather than as a bucket value below it.
+"""
+from typing import Optional
+
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+# Largest tracked value is 2**MAX_BITS ns (about 18 minutes); anything
+# longer is counted in `overflow`, and `max` still holds it exactly
+MAX_BITS = 40
+BUCKET_COUNT = (MAX_BITS - SUB_BUCKET_BITS + 1) * SUB_BUCKET_COUNT
+
+
+def _bucket_range(index: int):
+    """Lowest and highest nanosecond value that falls into a bucket."""
+    if index < 2 * SUB_BUCKET_COUNT:
+        return index, index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    low = (index - (shift << SUB_BUCKET_BITS)) << shift
+    return low, low + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    __slots__ = ('counts', 'overflow', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        # Samples too long for the last bucket
+        self.overflow = 0
+        self.count = 0
+        # Exact sum, minimum and maximum in seconds
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float) -> None:
+        ns = int(seconds * 1e9)
+        shift = ns.bit_length() - SUB_BUCKET_BITS - 1
+        index = (shift << SUB_BUCKET_BITS) + (ns >> shift) if shift > 0 else ns
+        if index < BUCKET_COUNT:
+            self.counts[index] += 1
+        else:
+            self.overflow += 1
+        self.count += 1
+        self.total += seconds
+        if self.count == 1:
+            self.min = self.max = seconds
+        elif seconds > self.max:
+            self.max = seconds
+        elif seconds < self.min:
+            self.min = seconds
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """
+        Value in seconds that `pct` percent of the samples don't exceed.
+
+        The result is the middle of the bucket the percentile falls in,
+        clamped to the exact minimum and maximum. Past the last bucket it is
+        the exact maximum, which never under-reports the overflowed samples.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, round(self.count * pct / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                low, high = _bucket_range(index)
+                value = (low + high) / 2e9
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def copy(self) -> 'LatencyHistogram':
+        clone = LatencyHistogram()
+        clone.counts = self.counts[:]
+        clone.overflow = self.overflow
+        clone.count = self.count
+        clone.total = self.total
+        clone.min = self.min
+        clone.max = self.max
+        return clone
@@ -0,0 +1,123 @@
+# metrics/operation_log.py
+"""
+Compact, append-only log of tree operations for exact replay.
+
+Each entry is an operation code and an integer key, kept in two parallel
+arrays (one byte and eight bytes per entry) instead of a list of tuples, so
+a log of millions of operations stays small and appending never allocates
+a Python object. Saved logs use the same layout: a short header followed by
+the raw little-endian arrays.
+"""
+import struct
+import sys
+from array import array
+
+# Operation name -> code; the codes are part of the file format
+OPERATIONS = ('insert', 'delete', 'find')
+OPERATION_CODES = {name: code for code, name in enumerate(OPERATIONS)}
+
+# Keys are stored as signed 64-bit integers
+KEY_MIN = -2 ** 63
+KEY_MAX = 2 ** 63 - 1
+
+MAGIC = b'TREEOPS1'
+_HEADER = struct.Struct('<8sQ')
+
+
+class OperationLog:
+    __slots__ = ('codes', 'keys')
+
+    def __init__(self):
+        self.codes = array('B')
+        self.keys = array('q')
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __iter__(self):
+        """Yield (operation name, key) for every entry, oldest first."""
+        for code, key in zip(self.codes, self.keys):
+            yield OPERATIONS[code], key
+
+    def record(self, operation: str, key: int) -> None:
+        """
+        Append one operation.
+
+        Raises:
+            ValueError: Unknown operation, or a key that doesn't fit in a
+                        signed 64-bit integer
+        """
+        code = OPERATION_CODES.get(operation)
+        if code is None:
+            raise ValueError(f"unknown operation {operation!r}")
+        try:
+            self.keys.append(key)
+        except OverflowError:
+            raise ValueError(f"key {key} does not fit in 64 bits") from None
+        self.codes.append(code)
+
+    def record_many(self, operation: str, keys) -> None:
+        """Append the same operation for every key, in order."""
+        code = OPERATION_CODES.get(operation)
+        if code is None:
+            raise ValueError(f"unknown operation {operation!r}")
+        added = array('q')
+        try:
+            added.extend(keys)
+        except OverflowError:
+            raise ValueError("a key does not fit in 64 bits") from None
+        self.keys.extend(added)
+        self.codes.extend(array('B', [code]) * len(added))
+
+    def clear(self) -> None:
+        self.codes = array('B')
+        self.keys = array('q')
+
+    def replay(self, tree, start: int = 0, stop=None) -> None:
+        """
+        Apply entries [start, stop) to a tree as fast as possible.
+
+        Operations go through the tree's public insert/delete/find_path, so
+        its metrics count them as usual; layout is deferred to the end.
+        """
+        methods = (tree.insert, tree.delete, tree.find_path)
+        with tree.batch():
+            for code, key in zip(self.codes[start:stop], self.keys[start:stop]):
+                methods[code](key)
+
+    def save(self, path) -> None:
+        keys = self.keys
+        if sys.byteorder == 'big':
+            keys = array('q', keys)
+            keys.byteswap()
+        with open(path, 'wb') as out:
+            out.write(_HEADER.pack(MAGIC, len(self)))
+            self.codes.tofile(out)
+            keys.tofile(out)
+
+    @classmethod
+    def load(cls, path) -> 'OperationLog':
+        """
+        Read a log written by save().
+
+        Raises:
+            ValueError: The file is not an operation log or is truncated
+        """
+        log = cls()
+        with open(path, 'rb') as source:
+            header = source.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"{path} is not an operation log")
+            magic, count = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not an operation log")
+            try:
+                log.codes.fromfile(source, count)
+                log.keys.fromfile(source, count)
+            except EOFError:
+                raise ValueError(f"{path} is truncated") from None
+        if sys.byteorder == 'big':
+            log.keys.byteswap()
+        if log.codes and max(log.codes) >= len(OPERATIONS):
+            raise ValueError(f"{path} contains unknown operations")
+        return log
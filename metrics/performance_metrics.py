@@ -1,38 +1,139 @@
 # metrics/performance_metrics.py
 from collections import defaultdict
-import statistics
+from contextlib import contextmanager
 import time
+from .latency_histogram import LatencyHistogram
+from .ring_buffer import RingBuffer
+
+# Instrumentation levels, cheapest first:
+#   off       nothing is recorded; the trees run at raw-structure speed
+#   counters  operation, comparison, rotation and rebuild counts, no timing
+#   full      counters plus a latency histogram per operation
+INSTRUMENTATION_LEVELS = ('off', 'counters', 'full')
+
+# Number of most recent samples kept per time series
+RECENT_SAMPLES = 120
+
+
+def _recent_series():
+    return RingBuffer(RECENT_SAMPLES)
+
 
 class PerformanceMetrics:
-    def __init__(self):
+    def __init__(self, level: str = 'full'):
+        self.set_level(level)
         self.reset()
     
+    def set_level(self, level: str):
+        if level not in INSTRUMENTATION_LEVELS:
+            raise ValueError(f"Unknown instrumentation level {level!r}, "
+                             f"expected one of {', '.join(INSTRUMENTATION_LEVELS)}")
+        self.level = level
+        self.counting = level != 'off'
+        # Operations are only counted, not timed, while this is off
+        self.timing = level == 'full'
+    
     def reset(self):
         # Dictionary to store operation counts
         self.operations = defaultdict(int)
-        # Dictionary to store execution times for each operation
-        self.execution_times = defaultdict(list)
+        # Latency histogram for each operation, fixed size however long
+        # the app runs
+        self.execution_times = defaultdict(LatencyHistogram)
+        # Latency histogram for each named phase ('descent', 'rebalance',
+        # 'rebuild', 'layout', 'render'). Phase spans nest inside operations, so their
+        # times are also part of the operation times above.
+        self.phase_times = defaultdict(LatencyHistogram)
+        # Most recent samples per operation, for time-series charts:
+        # latencies by operation name, plus 'rotations' done and nodes
+        # 'rebuilt' by each operation
+        self.recent = defaultdict(_recent_series)
         self.comparisons = 0
         self.rotations = 0
+        self._last_rotations = 0
+        # Subtree rebuilds (BST rebuild mode) and the nodes they relinked
+        self.rebuilds = 0
+        self.rebuilt_nodes = 0
+        self._last_rebuilt_nodes = 0
+    
+    def snapshot(self):
+        """Independent copy of the current counters and samples."""
+        copy = PerformanceMetrics(self.level)
+        copy.timing = self.timing
+        copy.operations.update(self.operations)
+        for name, histogram in self.execution_times.items():
+            copy.execution_times[name] = histogram.copy()
+        for name, histogram in self.phase_times.items():
+            copy.phase_times[name] = histogram.copy()
+        for name, series in self.recent.items():
+            copy.recent[name] = series.copy()
+        copy.comparisons = self.comparisons
+        copy.rotations = self.rotations
+        copy._last_rotations = self._last_rotations
+        copy.rebuilds = self.rebuilds
+        copy.rebuilt_nodes = self.rebuilt_nodes
+        copy._last_rebuilt_nodes = self._last_rebuilt_nodes
+        return copy
     
     def start_operation(self):
-        return time.perf_counter()
+        return time.perf_counter() if self.timing else None
     
     def end_operation(self, operation_name, start_time):
-        end_time = time.perf_counter()
-        duration = end_time - start_time
+        if not self.counting:
+            return
         self.operations[operation_name] += 1
-        self.execution_times[operation_name].append(duration)
+        self.recent['rotations'].append(self.rotations - self._last_rotations)
+        self._last_rotations = self.rotations
+        self.recent['rebuilt'].append(self.rebuilt_nodes - self._last_rebuilt_nodes)
+        self._last_rebuilt_nodes = self.rebuilt_nodes
+        if start_time is None:
+            return
+        duration = time.perf_counter() - start_time
+        self.execution_times[operation_name].record(duration)
+        self.recent[operation_name].append(duration)
+    
+    def start_span(self):
+        return time.perf_counter() if self.timing else None
+    
+    def end_span(self, phase_name, start_time):
+        if start_time is not None:
+            self.phase_times[phase_name].record(time.perf_counter() - start_time)
+    
+    @contextmanager
+    def span(self, phase_name):
+        """Time the enclosed block as one sample of a phase."""
+        start_time = self.start_span()
+        try:
+            yield
+        finally:
+            self.end_span(phase_name, start_time)
+    
+    def get_phase_avg_time(self, phase_name):
+        histogram = self.phase_times.get(phase_name)
+        return histogram.mean() if histogram else 0.0
     
     def get_avg_time(self, operation_name):
-        times = self.execution_times.get(operation_name, [])
-        if not times:
-            return 0.0
-        # Filter out any extreme outliers
-        filtered_times = [t for t in times if t < 1.0]  # Remove times > 1 second
-        return statistics.mean(filtered_times) if filtered_times else 0.0
-    def increment_comparisons(self):
-        self.comparisons += 1
+        histogram = self.execution_times.get(operation_name)
+        return histogram.mean() if histogram else 0.0
+    
+    def get_percentile(self, operation_name, pct):
+        histogram = self.execution_times.get(operation_name)
+        return histogram.percentile(pct) if histogram else 0.0
+    
+    def get_max_time(self, operation_name):
+        histogram = self.execution_times.get(operation_name)
+        return histogram.max if histogram else 0.0
+    
+    def increment_comparisons(self, count=1):
+        # Trees count comparisons locally and flush them once per operation
+        if self.counting:
+            self.comparisons += count
     
     def increment_rotations(self):
-        self.rotations += 1
\ No newline at end of file
+        if self.counting:
+            self.rotations += 1
+    
+    def increment_rebuilds(self, nodes):
+        """Count one subtree rebuild that relinked `nodes` nodes."""
+        if self.counting:
+            self.rebuilds += 1
+            self.rebuilt_nodes += nodes
\ No newline at end of file
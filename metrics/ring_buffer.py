@@ -0,0 +1,43 @@
+# metrics/ring_buffer.py
+from array import array
+
+
+class RingBuffer:
+    """
+    Fixed-capacity buffer of the most recent numeric samples.
+
+    Samples live in one preallocated array, so appending is O(1) and never
+    allocates; the oldest sample is overwritten once the buffer is full.
+    """
+    __slots__ = ('capacity', 'data', 'index', 'total')
+
+    def __init__(self, capacity: int, typecode: str = 'd'):
+        self.capacity = capacity
+        self.data = array(typecode, [0]) * capacity
+        # Next slot to write and number of samples ever appended
+        self.index = 0
+        self.total = 0
+
+    def append(self, value) -> None:
+        self.data[self.index] = value
+        self.index += 1
+        if self.index == self.capacity:
+            self.index = 0
+        self.total += 1
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def values(self) -> list:
+        """Samples currently held, oldest first."""
+        if self.total < self.capacity:
+            return self.data[:self.index].tolist()
+        return (self.data[self.index:] + self.data[:self.index]).tolist()
+
+    def copy(self) -> 'RingBuffer':
+        clone = RingBuffer.__new__(RingBuffer)
+        clone.capacity = self.capacity
+        clone.data = array(self.data.typecode, self.data)
+        clone.index = self.index
+        clone.total = self.total
+        return clone
@@ -0,0 +1,131 @@
+# metrics/workloads.py
+"""
+Unique-key workloads for stress tests and benchmarks.
+
+Every generator draws its keys without replacement in time linear in the
+number of keys (plus a sort where the order calls for one), so there is no
+retry loop that could stall once the key range fills up.
+"""
+import random
+from typing import Callable, List, Optional, Sequence
+
+DISTRIBUTIONS = ('uniform', 'sorted', 'reverse', 'zipf', 'adversarial')
+
+# Skew of the zipf order: the key of rank i comes up with weight 1 / i**s
+ZIPF_EXPONENT = 1.0
+
+
+def generate_keys(count: int, low: int, high: int, distribution: str = 'uniform',
+                  rng: Optional[random.Random] = None) -> List[int]:
+    """
+    Draw `count` distinct integer keys from [low, high] in a given order.
+
+    Args:
+        count: Number of keys to draw
+        low, high: Inclusive key range
+        distribution: 'uniform' (random order), 'sorted', 'reverse',
+                      'zipf' (a skewed random order in which the smallest
+                      keys tend to come first) or 'adversarial' (see
+                      zigzag_order)
+        rng: Random source, the module-level one if omitted
+
+    Raises:
+        ValueError: Unknown distribution, or more keys than the range holds
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution {distribution!r}, "
+                         f"expected one of {', '.join(DISTRIBUTIONS)}")
+    if count < 0 or high < low:
+        raise ValueError("Key count and range must not be negative")
+    if count > high - low + 1:
+        raise ValueError(f"Cannot draw {count} distinct keys from "
+                         f"{high - low + 1} values in [{low}, {high}]")
+    rng = rng or random
+
+    # sample() over a range picks from the index set without materialising
+    # the range, so this stays O(count) however wide the range is
+    keys = rng.sample(range(low, high + 1), count)
+    if distribution == 'sorted':
+        keys.sort()
+    elif distribution == 'reverse':
+        keys.sort(reverse=True)
+    elif distribution == 'zipf':
+        keys = zipf_order(keys, rng)
+    elif distribution == 'adversarial':
+        keys = zigzag_order(keys)
+    return keys
+
+
+def zigzag_order(keys: Sequence[int]) -> List[int]:
+    """
+    Alternate between the smallest and the largest remaining key.
+
+    An unbalanced BST fed this order degenerates into a zigzag chain as tall
+    as the input, and an AVL tree has to repair it with double rotations.
+    """
+    ranked = sorted(keys)
+    order = []
+    lo, hi = 0, len(ranked) - 1
+    while lo <= hi:
+        order.append(ranked[lo])
+        if lo != hi:
+            order.append(ranked[hi])
+        lo += 1
+        hi -= 1
+    return order
+
+
+def zipf_order(keys: Sequence[int], rng: random.Random,
+               exponent: float = ZIPF_EXPONENT) -> List[int]:
+    """
+    Randomly order distinct keys so that small keys tend to come first.
+
+    This is a weighted shuffle: each key waits an exponential time whose
+    rate is the zipf weight of its rank, and the keys are emitted in order
+    of arrival. It is the same as repeatedly drawing a not-yet-used key with
+    probability proportional to its weight, without any redraws.
+    """
+    ranked = sorted(keys)
+    expovariate = rng.expovariate
+    arrival = [expovariate(1.0) * (rank ** exponent)
+               for rank in range(1, len(ranked) + 1)]
+    order = sorted(range(len(ranked)), key=arrival.__getitem__)
+    return [ranked[i] for i in order]
+
+
+def free_key(contains: Callable[[int], bool], values: Callable[[], Sequence[int]],
+             low: int, high: int, rng: Optional[random.Random] = None,
+             attempts: int = 16) -> Optional[int]:
+    """
+    Pick a random key in [low, high] that isn't in a tree yet.
+
+    A few random probes settle it while the range is sparse. After that the
+    sorted tree contents are scanned once for a uniformly chosen gap.
+
+    Args:
+        contains: Membership test of the tree
+        values: Returns the tree's keys in ascending order
+        low, high: Inclusive key range
+        rng: Random source, the module-level one if omitted
+        attempts: Number of random probes before scanning
+
+    Returns:
+        int: A free key, or None when every key in the range is taken
+    """
+    rng = rng or random
+    for _ in range(attempts):
+        value = rng.randint(low, high)
+        if not contains(value):
+            return value
+
+    taken = [v for v in values() if low <= v <= high]
+    free = (high - low + 1) - len(taken)
+    if free <= 0:
+        return None
+    # Skip over the taken keys to the chosen free slot
+    value = low + rng.randrange(free)
+    for v in taken:
+        if v > value:
+            break
+        value += 1
+    return value
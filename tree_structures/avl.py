@@ -1,13 +1,20 @@
 # tree_structures/avl.py
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from .base_tree import BaseTree
 from .node import Node
 from metrics.performance_metrics import PerformanceMetrics
 
+# Cost of a split/join per level walked, relative to one level of a plain
+# insert or delete descent. union()/difference() handle a pair of subtrees one
+# key at a time wherever that is cheaper (see _by_key()); the values are
+# measured, and a delete that misses is much cheaper than an insert
+UNION_JOIN_COST = 3
+DIFFERENCE_JOIN_COST = 8
+
 class AVLTree(BaseTree):
-    def __init__(self):
-        super().__init__()
-        self.metrics = PerformanceMetrics()
+    def __init__(self, instrumentation: str = 'full', order_statistics: bool = True):
+        super().__init__(order_statistics)
+        self.metrics = PerformanceMetrics(instrumentation)
     
     def _get_height(self, node: Optional[Node]) -> int:
         if not node:
@@ -25,9 +32,13 @@ class AVLTree(BaseTree):
         node.height = max(self._get_height(node.left), 
                          self._get_height(node.right)) + 1
     
+    def _update_size(self, node: Node) -> None:
+        node.size = self._size(node.left) + self._size(node.right) + 1
+    
     def _rotate_right(self, y: Node) -> Node:
         self.metrics.increment_rotations()
         x = y.left
+        self._invalidate_layout((x, y))
         T2 = x.right
         
         x.right = y
@@ -35,12 +46,15 @@ class AVLTree(BaseTree):
         
         self._update_height(y)
         self._update_height(x)
+        self._update_size(y)
+        self._update_size(x)
         
         return x
     
     def _rotate_left(self, x: Node) -> Node:
         self.metrics.increment_rotations()
         y = x.right
+        self._invalidate_layout((x, y))
         T2 = y.left
         
         y.left = x
@@ -48,16 +62,19 @@ class AVLTree(BaseTree):
         
         self._update_height(x)
         self._update_height(y)
+        self._update_size(x)
+        self._update_size(y)
         
         return y
     
     def insert(self, value: int) -> bool:
-        if self.contains(value):
+        # The descent both detects duplicates and finds the insertion point,
+        # so a rejected duplicate is not recorded as an operation.
+        start_time = self.metrics.start_operation()
+        if not self._insert_iterative(value):
             return False
         
-        start_time = self.metrics.start_operation()
         try:
-            self.root = self._insert_recursive(self.root, value)
             self._update_positions()
         finally:
             self.metrics.end_operation('insert', start_time)
@@ -72,40 +89,99 @@ class AVLTree(BaseTree):
         """
         # Start timing the find operation
         start_time = self.metrics.start_operation()
+        span = self.metrics.start_span()
         
         try:
-            if not self.root:
-                return None
-            
             path = []
             current = self.root
             
             while current:
                 path.append(current)
-                self.metrics.increment_comparisons()
-                
                 if value == current.value:
-                    return path
+                    break
                 elif value < current.value:
                     current = current.left
                 else:
                     current = current.right
             
-            return None
+            # One comparison per node on the path
+            self.metrics.increment_comparisons(len(path))
+            return path if current else None
         finally:
+            self.metrics.end_span('descent', span)
             # End timing and record the operation
             self.metrics.end_operation('find', start_time)
     
-    def _insert_recursive(self, node: Optional[Node], value: int) -> Node:
-        if not node:
-            return Node(value)
+    def _insert_iterative(self, value: int) -> bool:
+        if not self.root:
+            self.root = Node(value)
+            return True
+        
+        # Descend to the insertion point, remembering the ancestors so they
+        # can be rebalanced bottom-up afterwards.
+        span = self.metrics.start_span()
+        path = []
+        node = self.root
+        while node:
+            if value == node.value:
+                # A rejected call is not an operation, so its comparisons
+                # aren't counted either
+                self.metrics.end_span('descent', span)
+                return False
+            path.append(node)
+            node = node.left if value < node.value else node.right
+        self.metrics.increment_comparisons(len(path))
         
-        self.metrics.increment_comparisons()
-        if value < node.value:
-            node.left = self._insert_recursive(node.left, value)
+        parent = path[-1]
+        if value < parent.value:
+            parent.left = Node(value)
         else:
-            node.right = self._insert_recursive(node.right, value)
+            parent.right = Node(value)
+        if self.order_statistics:
+            for node in path:
+                node.size += 1
+        self.metrics.end_span('descent', span)
+        
+        span = self.metrics.start_span()
+        self._retrace(path, lambda n: self._rebalance_insert(n, value))
+        self.metrics.end_span('rebalance', span)
+        return True
+    
+    def _insert_many(self, values) -> int:
+        values = list(values)
+        if self.root or not values:
+            return super()._insert_many(values)
+        
+        # Into an empty tree, sorted input is built directly as a perfectly
+        # balanced tree instead of going through per-key rebalancing. The
+        # scan for sortedness looks at the input, not the tree, so like the
+        # sort in bulk_load() it isn't counted as tree comparisons
+        unique = [values[0]]
+        for value in values[1:]:
+            if value < unique[-1]:
+                return super()._insert_many(values)
+            if value != unique[-1]:
+                unique.append(value)
         
+        self.root = self._build_balanced(unique, 0, len(unique))
+        return len(unique)
+    
+    def _retrace(self, path: List[Node], rebalance) -> None:
+        """Rebalance the ancestors in `path` from the deepest one up to the root."""
+        self._invalidate_layout(path)
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            subtree = rebalance(node)
+            if subtree is node:
+                continue
+            if i == 0:
+                self.root = subtree
+            elif path[i - 1].left is node:
+                path[i - 1].left = subtree
+            else:
+                path[i - 1].right = subtree
+    
+    def _rebalance_insert(self, node: Node, value: int) -> Node:
         self._update_height(node)
         balance = self._get_balance(node)
         
@@ -130,40 +206,71 @@ class AVLTree(BaseTree):
         return node
     
     def delete(self, value: int) -> bool:
-        if not self.contains(value):
+        start_time = self.metrics.start_operation()
+        if not self._delete_iterative(value):
             return False
         
-        start_time = self.metrics.start_operation()
         try:
-            self.root = self._delete_recursive(self.root, value)
             self._update_positions()
         finally:
             self.metrics.end_operation('delete', start_time)
         
         return True
     
-    def _delete_recursive(self, node: Optional[Node], value: int) -> Optional[Node]:
+    def _delete_iterative(self, value: int) -> bool:
+        span = self.metrics.start_span()
+        path = []
+        node = self.root
+        while node:
+            if value == node.value:
+                break
+            path.append(node)
+            node = node.left if value < node.value else node.right
+        
         if not node:
-            return None
+            # Nothing to delete; like a duplicate insert, not counted
+            self.metrics.end_span('descent', span)
+            return False
+        comparisons = len(path) + 1
         
-        self.metrics.increment_comparisons()
-        if value < node.value:
-            node.left = self._delete_recursive(node.left, value)
-        elif value > node.value:
-            node.right = self._delete_recursive(node.right, value)
-        else:
-            if not node.left:
-                return node.right
-            elif not node.right:
-                return node.left
+        if node.left and node.right:
+            # Copy the in-order successor into this node and unlink the
+            # successor instead; every node down to it needs rebalancing.
+            path.append(node)
+            min_node = node.right
+            steps = 0
+            while min_node.left:
+                path.append(min_node)
+                min_node = min_node.left
+                steps += 1
+            # One comparison per step to find the successor and one per node
+            # walked again to unlink it (successor included).
+            comparisons += 2 * steps + 1
             
-            min_node = self._find_min(node.right)
             node.value = min_node.value
-            node.right = self._delete_recursive(node.right, min_node.value)
+            node, child = min_node, min_node.right
+        else:
+            child = node.left if node.left else node.right
+        self.metrics.increment_comparisons(comparisons)
         
-        if not node:
-            return None
+        if not path:
+            self.root = child
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        self._record_removed(node)
+        if self.order_statistics:
+            for ancestor in path:
+                ancestor.size -= 1
+        self.metrics.end_span('descent', span)
         
+        span = self.metrics.start_span()
+        self._retrace(path, self._rebalance)
+        self.metrics.end_span('rebalance', span)
+        return True
+    
+    def _rebalance(self, node: Node) -> Node:
         self._update_height(node)
         balance = self._get_balance(node)
         
@@ -187,9 +294,260 @@ class AVLTree(BaseTree):
         
         return node
     
-    def _find_min(self, node: Node) -> Node:
-        current = node
-        while current.left:
-            self.metrics.increment_comparisons()
-            current = current.left
-        return current
\ No newline at end of file
+    @classmethod
+    def join(cls, left: 'AVLTree', key: int, right: 'AVLTree') -> 'AVLTree':
+        """
+        Join two trees around a new key, in O(|height difference| + 1).
+        
+        Every key in `left` must be smaller than `key` and every key in
+        `right` larger. Their nodes move into the returned tree, leaving
+        both arguments empty.
+        
+        Raises:
+            ValueError: key doesn't lie strictly between the two trees
+        """
+        low = left._extreme(left.root, 'right')
+        high = right._extreme(right.root, 'left')
+        if (low is not None and not low.value < key) or \
+           (high is not None and not key < high.value):
+            raise ValueError(f"join key {key} does not separate the two trees")
+        
+        tree = cls(left.metrics.level,
+                   left.order_statistics and right.order_statistics)
+        start_time = tree.metrics.start_operation()
+        try:
+            tree.root = tree._join(left.root, Node(key), right.root)
+            left.root = right.root = None
+            tree._update_positions()
+        finally:
+            tree.metrics.end_operation('join', start_time)
+        return tree
+    
+    def split(self, key: int) -> Tuple['AVLTree', bool, 'AVLTree']:
+        """
+        Split the tree into the keys below and above `key`, in O(height).
+        
+        Returns:
+            tuple: (tree of smaller keys, whether key was present,
+                   tree of larger keys). The nodes move into the two new
+                   trees, leaving this one empty.
+        """
+        start_time = self.metrics.start_operation()
+        try:
+            left, found, right = self._split(self.root, key)
+            self.root = None
+            if found:
+                self._record_removed(found)
+        finally:
+            self.metrics.end_operation('split', start_time)
+        return self._adopt(left), found is not None, self._adopt(right)
+    
+    def union(self, other: 'AVLTree') -> None:
+        """
+        Add every key of `other` to this tree.
+        
+        The tree is split at each key of `other` and the pieces joined back
+        together, which takes O(m log(n/m + 1)) for trees of m <= n keys
+        plus the cost of creating the added nodes, instead of O(m log n)
+        with a full rebalance per insert(). Wherever a subtree of `other` is
+        small next to the part of this tree it lands in (all of `other`,
+        if it is much smaller) its keys are inserted one by one instead, so
+        this is never much slower than a loop of insert(). `other` is left
+        unchanged.
+        """
+        start_time = self.metrics.start_operation()
+        try:
+            if other is self:
+                return
+            self.root = self._union(self.root, other.root)
+            self._update_positions()
+        finally:
+            self.metrics.end_operation('union', start_time)
+    
+    def intersection(self, other: 'AVLTree') -> None:
+        """Keep only the keys that are also in `other`, in O(m log(n/m + 1))."""
+        start_time = self.metrics.start_operation()
+        try:
+            if other is not self:
+                self.root = self._intersection(self.root, other.root)
+                self._update_positions()
+        finally:
+            self.metrics.end_operation('intersection', start_time)
+    
+    def difference(self, other: 'AVLTree') -> None:
+        """
+        Remove every key that is in `other`, in O(m log(n/m + 1)).
+        
+        Like union(), small subtrees of `other` are deleted key by key.
+        """
+        start_time = self.metrics.start_operation()
+        try:
+            if other is self:
+                if self.root:
+                    self._record_removed_subtree(self.root)
+                self.root = None
+            else:
+                self.root = self._difference(self.root, other.root)
+            self._update_positions()
+        finally:
+            self.metrics.end_operation('difference', start_time)
+    
+    def _by_key(self, a: Optional[Node], b: Node, join_cost: float) -> bool:
+        """
+        Whether applying the keys of subtree b to subtree a one at a time is
+        cheaper than splitting a at them: each key costs a descent of a's
+        height one way, and join_cost per level of the height gap the
+        other way.
+        """
+        height = self._get_height(a)
+        return height < join_cost * (height - b.height + 1)
+    
+    def _by_key_in(self, a: Optional[Node], b: Node, apply) -> Optional[Node]:
+        """Run apply(key) (an insert or delete) inside subtree a for every key of b."""
+        # The per-key methods work on self.root; the real root is put back
+        # by the set operation once the whole recursion is done
+        saved, self.root = self.root, a
+        try:
+            stack = [b]
+            while stack:
+                node = stack.pop()
+                apply(node.value)
+                if node.left:
+                    stack.append(node.left)
+                if node.right:
+                    stack.append(node.right)
+            return self.root
+        finally:
+            self.root = saved
+    
+    def _adopt(self, root: Optional[Node]) -> 'AVLTree':
+        """New tree of the same kind built around an existing subtree."""
+        tree = type(self)(self.metrics.level, self.order_statistics)
+        tree.root = root
+        tree._update_positions()
+        return tree
+    
+    @staticmethod
+    def _extreme(node: Optional[Node], side: str) -> Optional[Node]:
+        while node and getattr(node, side):
+            node = getattr(node, side)
+        return node
+    
+    def _join(self, left: Optional[Node], pivot: Node,
+              right: Optional[Node]) -> Node:
+        """
+        Join two AVL subtrees through `pivot`, where left < pivot < right.
+        
+        The pivot goes down the inner spine of the taller subtree to the
+        first node at most one level taller than the other subtree, and the
+        spine above it is rebalanced on the way back up like after a
+        delete.
+        """
+        left_height, right_height = self._get_height(left), self._get_height(right)
+        if left_height > right_height + 1:
+            side, node, stop = 'right', left, right_height + 1
+        elif right_height > left_height + 1:
+            side, node, stop = 'left', right, left_height + 1
+        else:
+            side, node, stop = None, None, 0
+        
+        spine = []
+        while node and node.height > stop:
+            spine.append(node)
+            node = getattr(node, side)
+        if side == 'right':
+            pivot.left, pivot.right = node, right
+        elif side == 'left':
+            pivot.left, pivot.right = left, node
+        else:
+            pivot.left, pivot.right = left, right
+        pivot.height = max(self._get_height(pivot.left),
+                           self._get_height(pivot.right)) + 1
+        pivot.size = self._size(pivot.left) + self._size(pivot.right) + 1
+        pivot.layout = None
+        self._invalidate_layout(spine)
+        
+        subtree = pivot
+        for parent in reversed(spine):
+            setattr(parent, side, subtree)
+            self._update_size(parent)
+            subtree = self._rebalance(parent)
+        return subtree
+    
+    def _join2(self, left: Optional[Node], right: Optional[Node]) -> Optional[Node]:
+        """Join two subtrees with left < right, using the largest key of left as the pivot."""
+        if not left:
+            return right
+        if not right:
+            return left
+        spine = []
+        node = left
+        while node.right:
+            spine.append(node)
+            node = node.right
+        rest = node.left
+        for parent in reversed(spine):
+            rest = self._join(parent.left, parent, rest)
+        return self._join(rest, node, right)
+    
+    def _split(self, root: Optional[Node], key: int):
+        """
+        Split a subtree into (keys < key, node holding key or None, keys > key).
+        
+        Each ancestor of the split point is joined onto the side it belongs
+        to, bottom-up; the joins telescope to O(height) in total.
+        """
+        path = []
+        node = root
+        while node and node.value != key:
+            path.append(node)
+            node = node.left if key < node.value else node.right
+        self.metrics.increment_comparisons(len(path) + 1 if node else len(path))
+        
+        if node:
+            left, right = node.left, node.right
+            node.left = node.right = None
+        else:
+            left = right = None
+        for ancestor in reversed(path):
+            if key < ancestor.value:
+                right = self._join(right, ancestor, ancestor.right)
+            else:
+                left = self._join(ancestor.left, ancestor, left)
+        return left, node, right
+    
+    # The set operations walk `b` read-only and consume the subtree `a`.
+    # Recursion follows the structure of `b`, so its depth is the AVL height.
+    
+    def _union(self, a: Optional[Node], b: Optional[Node]) -> Optional[Node]:
+        if not b:
+            return a
+        if self._by_key(a, b, UNION_JOIN_COST):
+            return self._by_key_in(a, b, self._insert_iterative)
+        left, found, right = self._split(a, b.value)
+        return self._join(self._union(left, b.left), found or Node(b.value),
+                          self._union(right, b.right))
+    
+    def _intersection(self, a: Optional[Node], b: Optional[Node]) -> Optional[Node]:
+        if not a:
+            return None
+        if not b:
+            self._record_removed_subtree(a)
+            return None
+        left, found, right = self._split(a, b.value)
+        left = self._intersection(left, b.left)
+        right = self._intersection(right, b.right)
+        if found:
+            return self._join(left, found, right)
+        return self._join2(left, right)
+    
+    def _difference(self, a: Optional[Node], b: Optional[Node]) -> Optional[Node]:
+        if not a or not b:
+            return a
+        if self._by_key(a, b, DIFFERENCE_JOIN_COST):
+            return self._by_key_in(a, b, self._delete_iterative)
+        left, found, right = self._split(a, b.value)
+        if found:
+            self._record_removed(found)
+        return self._join2(self._difference(left, b.left),
+                           self._difference(right, b.right))
@@ -1,217 +1,328 @@
-from typing import Optional, Dict, List
-import tkinter as tk
+import gc
+from contextlib import contextmanager
+from .bulk_build import sorted_unique_keys
+from .layout import TidyTreeLayout
 from .node import Node
-from gui.styles import TreeVisualizerStyles as Styles
 
 
 class BaseTree:
-    def __init__(self):
+    def __init__(self, order_statistics: bool = True):
         self.root = None
+        # Keep Node.size up to date so rank/select/count_range run in
+        # O(height); fixed for the lifetime of the tree
+        self.order_statistics = order_statistics
         self.node_radius = 20
         self.horizontal_spacing = 50
         self.vertical_spacing = 70
-        self.tooltip = None
+        self.layout_engine = TidyTreeLayout(self.node_radius,
+                                            self.horizontal_spacing,
+                                            self.vertical_spacing)
+        # Change journal for a retained-mode renderer, only kept while
+        # track_changes is on: nodes re-merged or moved by layout passes and
+        # nodes unlinked from the tree since the renderer last drained it.
+        self.track_changes = False
+        self.changed_nodes = set()
+        self.removed_nodes = []
+        # Open batch() contexts and whether a layout was skipped inside them
+        self._batch_depth = 0
+        self._layout_pending = False
 
     def contains(self, value: int) -> bool:
-        return self._contains_recursive(self.root, value)
+        node = self.root
+        while node:
+            if node.value == value:
+                return True
+            node = node.left if value < node.value else node.right
+        return False
 
-    def _contains_recursive(self, node: Optional[Node], value: int) -> bool:
-        if not node:
-            return False
-        if node.value == value:
-            return True
-        if value < node.value:
-            return self._contains_recursive(node.left, value)
-        return self._contains_recursive(node.right, value)
+    def values(self):
+        """Yield every value in ascending order."""
+        return self.iter_range()
 
-    def _update_positions(self):
-        if not self.root:
-            return
+    def iter_range(self, lo=None, hi=None, reverse: bool = False):
+        """
+        Lazily yield the keys in [lo, hi] in order (descending if reverse).
         
-        # Track occupied horizontal positions at each level
-        level_occupied_positions: Dict[int, List[float]] = {}
+        Either bound may be None for an open end. Costs O(height + k) for k
+        keys yielded; see iter_nodes().
+        """
+        for node in self.iter_nodes(lo, hi, reverse):
+            yield node.value
+
+    def iter_nodes(self, lo=None, hi=None, reverse: bool = False):
+        """
+        Lazily yield the nodes with keys in [lo, hi], in key order.
         
-        def calculate_node_position(node, level, x_range_start, x_range_end):
-            """
-            Recursively calculate node positions with overlap prevention
-            
-            Args:
-                node: Current node being positioned
-                level: Current tree level (depth)
-                x_range_start: Minimum allowed x position
-                x_range_end: Maximum allowed x position
-            
-            Returns:
-                float: The calculated x position for the node
-            """
-            if not node:
-                return None
-            
-            # Calculate mid-point of allowed x range
-            mid_x = (x_range_start + x_range_end) / 2
-            
-            # Determine y position based on level
-            node.y = level * self.vertical_spacing
-            
-            # Initialize positions for this level if not exists
-            if level not in level_occupied_positions:
-                level_occupied_positions[level] = []
-            
-            # Find a suitable x position
-            x_candidates = [mid_x]
-            search_directions = [1, -1]  # Alternate searching left and right
-            
-            for direction in search_directions:
-                for offset_multiplier in range(1, 10):  # Limit search range
-                    offset = direction * offset_multiplier * (self.node_radius * 2 + self.horizontal_spacing)
-                    candidate_x = mid_x + offset
-                    
-                    # Check if candidate is within original x range
-                    if candidate_x < x_range_start or candidate_x > x_range_end:
-                        break
-                    
-                    # Check for overlap with existing nodes at this level
-                    if all(abs(candidate_x - pos) > self.node_radius * 2 + self.horizontal_spacing 
-                           for pos in level_occupied_positions[level]):
-                        x_candidates.append(candidate_x)
-                        break
-            
-            # Select first valid x position
-            node_x = x_candidates[0]
-            
-            # Register this position as occupied
-            level_occupied_positions[level].append(node_x)
-            node.x = node_x
-            
-            # Calculate child ranges dynamically
-            if node.left:
-                calculate_node_position(
-                    node.left, 
-                    level + 1, 
-                    x_range_start, 
-                    node_x - self.node_radius
-                )
-            
-            if node.right:
-                calculate_node_position(
-                    node.right, 
-                    level + 1, 
-                    node_x + self.node_radius, 
-                    x_range_end
-                )
+        The walk keeps its own stack instead of recursing, so even a BST
+        degenerated into a chain can't overflow the interpreter stack, and
+        subtrees entirely outside the range are never entered. The tree
+        must not be changed while the generator is in use.
+        """
+        if reverse:
+            near, far, first, last = 'right', 'left', hi, lo
+            before = lambda a, b: a > b
+        else:
+            near, far, first, last = 'left', 'right', lo, hi
+            before = lambda a, b: a < b
+
+        stack = []
+        node = self.root
+        while stack or node:
+            # Go down towards the start of the range, skipping every node
+            # (and its near subtree) that comes before it
+            while node:
+                if first is not None and before(node.value, first):
+                    node = getattr(node, far)
+                else:
+                    stack.append(node)
+                    node = getattr(node, near)
+            if not stack:
+                return
+            node = stack.pop()
+            if last is not None and before(last, node.value):
+                return
+            yield node
+            node = getattr(node, far)
+
+    def copy(self, layout: bool = True):
+        """
+        Structural copy of the tree with fresh metrics at the same
+        instrumentation level.
         
-        # Initial call with full canvas width 
-        # Assuming a reasonable initial canvas width of 1000
-        calculate_node_position(self.root, 0, 0, 1000)
+        The copy shares no nodes with this tree, so it can be mutated on
+        another thread while this one is still being drawn. With layout
+        False it is left unlaid out until its first layout pass.
+        """
+        clone = type(self)(self.metrics.level, self.order_statistics)
+        if self.root:
+            clone.root = self._copy_node(self.root)
+            stack = [(self.root, clone.root)]
+            while stack:
+                node, copy = stack.pop()
+                if node.left:
+                    copy.left = self._copy_node(node.left)
+                    stack.append((node.left, copy.left))
+                if node.right:
+                    copy.right = self._copy_node(node.right)
+                    stack.append((node.right, copy.right))
+            if layout:
+                clone._update_positions()
+        return clone
+
+    @staticmethod
+    def _copy_node(node: Node) -> Node:
+        return Node(node.value, height=node.height, size=node.size)
+
+    @staticmethod
+    def _size(node) -> int:
+        return node.size if node else 0
 
-    def draw_tree(self, canvas, tree, highlight_path=None):
-        canvas.delete("all")
+    def _require_order_statistics(self) -> None:
+        if not self.order_statistics:
+            raise RuntimeError(f"{type(self).__name__} was created with "
+                               "order_statistics=False")
+
+    def _count_below(self, value, inclusive: bool) -> int:
+        """Number of keys < value (<= value if inclusive), counting comparisons."""
+        count = 0
+        visited = 0
+        node = self.root
+        while node:
+            visited += 1
+            if value < node.value:
+                node = node.left
+            elif value > node.value:
+                count += self._size(node.left) + 1
+                node = node.right
+            else:
+                count += self._size(node.left) + (1 if inclusive else 0)
+                break
+        self.metrics.increment_comparisons(visited)
+        return count
+
+    def rank(self, value) -> int:
+        """Number of keys smaller than `value`, in O(height)."""
+        self._require_order_statistics()
+        start_time = self.metrics.start_operation()
+        span = self.metrics.start_span()
+        try:
+            return self._count_below(value, inclusive=False)
+        finally:
+            self.metrics.end_span('descent', span)
+            self.metrics.end_operation('rank', start_time)
+
+    def select(self, k: int):
+        """
+        The k-th smallest key, counting from 0, in O(height).
         
-        title_text = "Binary Search Tree" if isinstance(tree, self.BST) else "AVL Tree"
-        canvas.create_text(20, 20, text=title_text, 
-                         font=Styles.HEADER_FONT, anchor="w")
+        rank(select(k)) == k for every valid k.
         
-        def draw_node(node, is_avl=False):
-            if not node:
-                return
-            
-            # Draw edges
-            if node.left:
-                is_path_edge = (highlight_path and 
-                              node in highlight_path and 
-                              node.left in highlight_path)
-                edge_color = Styles.HIGHLIGHT_PATH_COLOR if is_path_edge else Styles.EDGE_COLOR
-                edge_width = 3 if is_path_edge else 2
-                
-                canvas.create_line(node.x, node.y, 
-                                 node.left.x, node.left.y,
-                                 width=edge_width, fill=edge_color)
-            
-            if node.right:
-                is_path_edge = (highlight_path and 
-                              node in highlight_path and 
-                              node.right in highlight_path)
-                edge_color = Styles.HIGHLIGHT_PATH_COLOR if is_path_edge else Styles.EDGE_COLOR
-                edge_width = 3 if is_path_edge else 2
-                
-                canvas.create_line(node.x, node.y, 
-                                 node.right.x, node.right.y,
-                                 width=edge_width, fill=edge_color)
-            
-            # Determine node colors
-            is_highlight = highlight_path and node in highlight_path
-            is_target = highlight_path and node == highlight_path[-1]
-            
-            if is_target:
-                fill_color = Styles.FOUND_NODE_FILL
-                border_color = Styles.FOUND_NODE_BORDER
-            elif is_highlight:
-                fill_color = Styles.PATH_NODE_FILL
-                border_color = Styles.HIGHLIGHT_PATH_COLOR
-            else:
-                fill_color, border_color = Styles.get_node_colors(is_avl, 
-                                                            node.height if is_avl else 1)
-            
-            # Add hover functionality
-            canvas.tag_bind(f"node_{id(node)}", "<Enter>", lambda e, n=node: self.show_tooltip(e, n.value))
-            canvas.tag_bind(f"node_{id(node)}", "<Leave>", lambda e: self.hide_tooltip())
-            
-            canvas.create_oval(node.x - self.node_radius, 
-                             node.y - self.node_radius,
-                             node.x + self.node_radius, 
-                             node.y + self.node_radius,
-                             tags=f"node_{id(node)}",
-                             fill=fill_color, 
-                             outline=border_color,
-                             width=3 if is_highlight else 2)
-            
-            text_color = "#FFFFFF" if is_target else "#000000"
-            text = str(node.value)
-            if is_avl:
-                canvas.create_text(node.x, node.y + 15,
-                                 text=f"h={node.height}",
-                                 font=Styles.NORMAL_FONT,
-                                 fill=text_color)
-            
-            canvas.create_text(node.x, node.y - (5 if is_avl else 0),
-                             text=text,
-                             font=Styles.NODE_FONT,
-                             fill=text_color)
-            
-            draw_node(node.left, is_avl)
-            draw_node(node.right, is_avl)
+        Raises:
+            IndexError: k is not in range(len of the tree)
+        """
+        self._require_order_statistics()
+        if not 0 <= k < self._size(self.root):
+            raise IndexError(f"select({k}) on a tree of {self._size(self.root)} keys")
+        start_time = self.metrics.start_operation()
+        span = self.metrics.start_span()
+        visited = 0
+        try:
+            node = self.root
+            while True:
+                visited += 1
+                left_size = self._size(node.left)
+                if k < left_size:
+                    node = node.left
+                elif k > left_size:
+                    k -= left_size + 1
+                    node = node.right
+                else:
+                    return node.value
+        finally:
+            self.metrics.increment_comparisons(visited)
+            self.metrics.end_span('descent', span)
+            self.metrics.end_operation('select', start_time)
+
+    def count_range(self, lo, hi) -> int:
+        """Number of keys in [lo, hi], in O(height)."""
+        self._require_order_statistics()
+        start_time = self.metrics.start_operation()
+        span = self.metrics.start_span()
+        try:
+            if hi < lo:
+                return 0
+            return (self._count_below(hi, inclusive=True)
+                    - self._count_below(lo, inclusive=False))
+        finally:
+            self.metrics.end_span('descent', span)
+            self.metrics.end_operation('count_range', start_time)
+
+    def insert_many(self, values) -> int:
+        """
+        Insert every value from an iterable with one layout pass at the end.
         
-        draw_node(tree.root, isinstance(tree, self.AVLTree))
-        self._center_tree(canvas)
-
-    def _center_tree(self, canvas):
-        bbox = canvas.bbox('all')
-        if bbox:
-            canvas_width = canvas.winfo_width()
-            canvas_height = canvas.winfo_height()
-            if bbox[2] - bbox[0] > 0:
-                scale = min((canvas_width - 80) / (bbox[2] - bbox[0]),
-                          (canvas_height - 80) / (bbox[3] - bbox[1]))
-                canvas.scale('all', bbox[0], bbox[1], scale, scale)
-            
-            bbox = canvas.bbox('all')
-            if bbox:
-                dx = (canvas_width - (bbox[2] + bbox[0])) / 2
-                dy = (canvas_height - (bbox[3] + bbox[1])) / 2
-                canvas.move('all', dx, dy)
-
-    def show_tooltip(self, event, value):
-        if self.tooltip:
-            self.tooltip.destroy()
+        Duplicates are skipped like in insert(). The whole call is recorded
+        as a single 'insert_many' operation.
         
-        self.tooltip = tk.Toplevel(event.widget)
-        self.tooltip.wm_overrideredirect(True)
-        self.tooltip.geometry(f"+{event.x_root}+{event.y_root}")
-        label = tk.Label(self.tooltip, text=f"Node Value: {value}", 
-                        background="#FFFFDD", relief=tk.SOLID, borderwidth=1)
-        label.pack()
-
-    def hide_tooltip(self):
-        if self.tooltip:
-            self.tooltip.destroy()
-            self.tooltip = None
\ No newline at end of file
+        Returns:
+            int: The number of values actually inserted
+        """
+        start_time = self.metrics.start_operation()
+        try:
+            inserted = self._insert_many(values)
+            if inserted:
+                self._update_positions()
+        finally:
+            self.metrics.end_operation('insert_many', start_time)
+        
+        return inserted
+
+    def _insert_many(self, values) -> int:
+        inserted = 0
+        for value in values:
+            if self._insert_iterative(value):
+                inserted += 1
+        return inserted
+
+    def bulk_load(self, values, processes=None) -> int:
+        """
+        Replace the contents with a perfectly balanced tree of `values`.
+        
+        Sorting and deduplicating large inputs is spread over `processes`
+        worker processes (see bulk_build); the tree itself is then built
+        in O(n) with one layout pass. The whole call is recorded as a
+        single 'bulk_load' operation.
+        
+        Returns:
+            int: The number of distinct values loaded
+        """
+        start_time = self.metrics.start_operation()
+        try:
+            keys = sorted_unique_keys(values, processes)
+            if self.root:
+                self._record_removed_subtree(self.root)
+            # Nodes never form reference cycles, and the collector would
+            # otherwise rescan the growing tree over and over while it is built
+            collecting = gc.isenabled()
+            gc.disable()
+            try:
+                self.root = self._build_balanced(keys, 0, len(keys))
+            finally:
+                if collecting:
+                    gc.enable()
+            self._update_positions()
+        finally:
+            self.metrics.end_operation('bulk_load', start_time)
+        
+        return len(keys)
+
+    def _build_balanced(self, values, lo: int, hi: int):
+        """Build a balanced subtree from sorted values[lo:hi], heights set bottom-up."""
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = Node(values[mid])
+        node.left = left = self._build_balanced(values, lo, mid)
+        node.right = self._build_balanced(values, mid + 1, hi)
+        node.size = hi - lo
+        # The left half is never shorter than the right one
+        if left:
+            node.height = left.height + 1
+        return node
+
+    @contextmanager
+    def batch(self, timed: bool = True, layout: bool = True):
+        """
+        Defer layout until the end of a block of operations.
+        
+        Every insert/delete inside the block still marks what it touched, and
+        a single incremental relayout runs when the outermost block exits.
+        
+        Args:
+            timed: Keep timing the individual operations; when False only
+                   their counts are recorded
+            layout: Run that relayout; when False (on the outermost block)
+                    the tree is left unlaid out until its next layout pass,
+                    which catches up on everything the block changed
+        """
+        timing = self.metrics.timing
+        self._batch_depth += 1
+        self.metrics.timing = timing and timed
+        try:
+            yield self
+        finally:
+            self.metrics.timing = timing
+            self._batch_depth -= 1
+            if not self._batch_depth and self._layout_pending and layout:
+                self._update_positions()
+
+    def _invalidate_layout(self, nodes) -> None:
+        """Mark nodes whose subtree changed so the next layout re-merges them."""
+        for node in nodes:
+            node.layout = None
+
+    def _record_removed(self, node) -> None:
+        if self.track_changes:
+            self.removed_nodes.append(node)
+
+    def _record_removed_subtree(self, root) -> None:
+        if self.track_changes:
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                self.removed_nodes.append(node)
+                if node.left:
+                    stack.append(node.left)
+                if node.right:
+                    stack.append(node.right)
+
+    def _update_positions(self):
+        if self._batch_depth:
+            self._layout_pending = True
+            return
+        self._layout_pending = False
+        span = self.metrics.start_span()
+        changed = self.layout_engine.update(self.root)
+        if self.track_changes:
+            self.changed_nodes.update(changed)
+        self.metrics.end_span('layout', span)
@@ -1,24 +1,79 @@
 # tree_structures/bst.py
+import math
 from typing import Optional, List
 from .base_tree import BaseTree
 from .node import Node
 from metrics.performance_metrics import PerformanceMetrics
 
 class BST(BaseTree):
-    def __init__(self):
-        super().__init__()
-        self.metrics = PerformanceMetrics()
+    # Balance factor for rebuild mode when none is given
+    DEFAULT_REBUILD_ALPHA = 2 / 3
+
+    def __init__(self, instrumentation: str = 'full', order_statistics: bool = True,
+                 rebuild_alpha: Optional[float] = None):
+        super().__init__(order_statistics)
+        self.metrics = PerformanceMetrics(instrumentation)
+        # Rebuild (scapegoat) mode, off unless an alpha is set; see
+        # set_rebuild_alpha()
+        self.rebuild_alpha = None
+        # Largest size since the whole tree was last rebuilt
+        self._max_size = 0
+        if rebuild_alpha is not None:
+            self.set_rebuild_alpha(rebuild_alpha)
+    
+    def set_rebuild_alpha(self, alpha: Optional[float]) -> None:
+        """
+        Turn rebuild mode on with balance factor alpha, or off with None.
+        
+        In rebuild mode the tree keeps its height within log(n) / log(1/alpha)
+        (about 1.7 * log2(n) for alpha = 2/3) the way a scapegoat tree does:
+        an insert that lands deeper than that rebuilds the subtree of the
+        lowest ancestor with a child holding more than alpha of its keys,
+        and deleting down to alpha of the largest size since the last full
+        rebuild rebuilds the whole tree. A rebuild relinks the existing
+        nodes into a perfectly balanced subtree in O(size) and is counted
+        in metrics.rebuilds and metrics.rebuilt_nodes. Turning the mode on
+        rebuilds the tree at once if it is already too tall.
+        
+        Raises:
+            ValueError: alpha is not between 0.5 and 1
+            RuntimeError: The tree was created with order_statistics=False
+        """
+        if alpha is not None:
+            if not 0.5 < alpha < 1:
+                raise ValueError(f"rebuild alpha must be between 0.5 and 1, not {alpha}")
+            # Finding the scapegoat relies on the subtree sizes
+            self._require_order_statistics()
+        self.rebuild_alpha = alpha
+        self._max_size = self._size(self.root)
+        if alpha is not None and self.root and self._too_tall(self.root):
+            self._rebuild_subtree(self.root, None)
+            self._update_positions()
+    
+    def copy(self, layout: bool = True):
+        clone = super().copy(layout)
+        clone.rebuild_alpha = self.rebuild_alpha
+        clone._max_size = self._max_size
+        return clone
+    
+    def bulk_load(self, values, processes=None) -> int:
+        loaded = super().bulk_load(values, processes)
+        self._max_size = loaded
+        return loaded
     
     def insert(self, value) -> bool:
-        if self.contains(value):
+        # The descent both detects duplicates and finds the insertion point,
+        # so a rejected duplicate is not recorded as an operation.
+        start_time = self.metrics.start_operation()
+        span = self.metrics.start_span()
+        path = self._insert_leaf(value)
+        self.metrics.end_span('descent', span)
+        if path is None:
             return False
         
-        start_time = self.metrics.start_operation()
         try:
-            if not self.root:
-                self.root = Node(value)
-            else:
-                self._insert_recursive(self.root, value)
+            # Timed as its own 'rebuild' phase, outside the descent
+            self._rebuild_after_insert(path)
             self._update_positions()
         finally:
             self.metrics.end_operation('insert', start_time)
@@ -26,106 +81,210 @@ class BST(BaseTree):
         return True
     
     def delete(self, value) -> bool:
-        if not self.contains(value):
+        start_time = self.metrics.start_operation()
+        span = self.metrics.start_span()
+        done = self._unlink(value)
+        self.metrics.end_span('descent', span)
+        if not done:
             return False
         
-        start_time = self.metrics.start_operation()
         try:
-            self.root = self._delete_recursive(self.root, value)
+            self._rebuild_after_delete()
             self._update_positions()
         finally:
             self.metrics.end_operation('delete', start_time)
         
         return True
     
-    def find_path(self, value) -> Optional[List[Node]]:
-        start_time = self.metrics.start_operation()
-        try:
-            if not self.root:
-                return None
-            
-            path = []
-            current = self.root
-            
-            while current:
-                path.append(current)
-                self.metrics.increment_comparisons()
-                
-                if value == current.value:
-                    return path
-                elif value < current.value:
-                    current = current.left
-                else:
-                    current = current.right
-            
-            return None
-        finally:
-            self.metrics.end_operation('find', start_time)
+    def _insert_iterative(self, value) -> bool:
+        path = self._insert_leaf(value)
+        if path is None:
+            return False
+        self._rebuild_after_insert(path)
+        return True
     
-    def _insert_recursive(self, node, value):
-        self.metrics.increment_comparisons()
-        if value < node.value:
-            if node.left is None:
-                node.left = Node(value)
-            else:
-                self._insert_recursive(node.left, value)
+    def _insert_leaf(self, value) -> Optional[List[Node]]:
+        """Add value as a new leaf; the path down to it, or None for a duplicate."""
+        if not self.root:
+            self.root = Node(value)
+            return []
+        
+        path = []
+        node = self.root
+        while node:
+            if value == node.value:
+                # A rejected call is not an operation, so its comparisons
+                # aren't counted either
+                return None
+            path.append(node)
+            node = node.left if value < node.value else node.right
+        self.metrics.increment_comparisons(len(path))
+        
+        parent = path[-1]
+        if value < parent.value:
+            parent.left = Node(value)
         else:
-            if node.right is None:
-                node.right = Node(value)
-            else:
-                self._insert_recursive(node.right, value)
+            parent.right = Node(value)
+        if self.order_statistics:
+            for node in path:
+                node.size += 1
+        
+        self._invalidate_layout(path)
+        return path
+    
+    def _delete_iterative(self, value) -> bool:
+        if not self._unlink(value):
+            return False
+        self._rebuild_after_delete()
+        return True
     
-    def _delete_recursive(self, node, value):
+    def _unlink(self, value) -> bool:
+        path = []
+        node = self.root
+        while node:
+            if value == node.value:
+                break
+            path.append(node)
+            node = node.left if value < node.value else node.right
+        
         if not node:
-            return None
+            # Nothing to delete; like a duplicate insert, not counted
+            return False
+        comparisons = len(path) + 1
         
-        self.metrics.increment_comparisons()
-        if value < node.value:
-            node.left = self._delete_recursive(node.left, value)
-        elif value > node.value:
-            node.right = self._delete_recursive(node.right, value)
-        else:
-            if not node.left:
-                return node.right
-            elif not node.right:
-                return node.left
+        if node.left and node.right:
+            # Replace the value with the in-order successor and unlink the
+            # successor, which has no left child.
+            path.append(node)
+            min_node = node.right
+            steps = 0
+            while min_node.left:
+                path.append(min_node)
+                min_node = min_node.left
+                steps += 1
+            # One comparison per step to find the successor and one per node
+            # walked again to unlink it (successor included).
+            comparisons += 2 * steps + 1
             
-            min_node = self._find_min(node.right)
             node.value = min_node.value
-            node.right = self._delete_recursive(node.right, min_node.value)
+            node, child = min_node, min_node.right
+        else:
+            child = node.left if node.left else node.right
+        self.metrics.increment_comparisons(comparisons)
         
-        return node
+        if not path:
+            self.root = child
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        self._record_removed(node)
+        if self.order_statistics:
+            for ancestor in path:
+                ancestor.size -= 1
+        
+        self._invalidate_layout(path)
+        return True
+    
+    def _height_bound(self, size: int) -> float:
+        """Deepest depth (in edges) rebuild mode allows for a tree of `size` keys."""
+        return math.log(size) / -math.log(self.rebuild_alpha)
     
-    def _find_min(self, node):
+    def _too_tall(self, root: Node) -> bool:
+        bound = self._height_bound(root.size)
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth > bound:
+                return True
+            if node.left:
+                stack.append((node.left, depth + 1))
+            if node.right:
+                stack.append((node.right, depth + 1))
+        return False
+    
+    def _rebuild_after_insert(self, path: List[Node]) -> None:
+        """Rebuild below the scapegoat if the node inserted under path[-1] is too deep."""
+        if self.rebuild_alpha is None:
+            return
+        self._max_size = max(self._max_size, self.root.size)
+        if len(path) <= self._height_bound(self._max_size):
+            return
+        
+        # Walk back up to the lowest ancestor whose child on the path holds
+        # more than alpha of its keys
+        child_size = 1
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            if child_size > self.rebuild_alpha * node.size:
+                self._rebuild_subtree(node, path[i - 1] if i else None)
+                return
+            child_size = node.size
+    
+    def _rebuild_after_delete(self) -> None:
+        """Rebuild the whole tree once it has shrunk below alpha of its largest size."""
+        if (self.rebuild_alpha is not None and self.root
+                and self.root.size < self.rebuild_alpha * self._max_size):
+            self._rebuild_subtree(self.root, None)
+    
+    def _rebuild_subtree(self, node: Node, parent: Optional[Node]) -> None:
+        """Relink the subtree of `node` (a child of `parent`) as a balanced one."""
+        span = self.metrics.start_span()
+        nodes = []
+        stack = []
         current = node
-        while current.left:
-            self.metrics.increment_comparisons()
-            current = current.left
-        return current
+        while stack or current:
+            while current:
+                stack.append(current)
+                current = current.left
+            current = stack.pop()
+            nodes.append(current)
+            current = current.right
+        
+        subtree = self._relink_balanced(nodes, 0, len(nodes))
+        if parent is None:
+            self.root = subtree
+            self._max_size = subtree.size
+        elif parent.left is node:
+            parent.left = subtree
+        else:
+            parent.right = subtree
+        self._invalidate_layout(nodes)
+        self.metrics.increment_rebuilds(len(nodes))
+        self.metrics.end_span('rebuild', span)
+    
+    def _relink_balanced(self, nodes: List[Node], lo: int, hi: int) -> Optional[Node]:
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        node.left = self._relink_balanced(nodes, lo, mid)
+        node.right = self._relink_balanced(nodes, mid + 1, hi)
+        node.size = hi - lo
+        return node
+    
     def find_path(self, value) -> Optional[List[Node]]:
-
         # Start timing the find operation
         start_time = self.metrics.start_operation()
+        span = self.metrics.start_span()
         
         try:
-            if not self.root:
-                return None
-            
             path = []
             current = self.root
             
             while current:
                 path.append(current)
-                self.metrics.increment_comparisons()
-                
                 if value == current.value:
-                    return path
+                    break
                 elif value < current.value:
                     current = current.left
                 else:
                     current = current.right
             
-            return None
+            # One comparison per node on the path
+            self.metrics.increment_comparisons(len(path))
+            return path if current else None
         finally:
+            self.metrics.end_span('descent', span)
             # End timing and record the operation
-            self.metrics.end_operation('find', start_time)
\ No newline at end of file
+            self.metrics.end_operation('find', start_time)
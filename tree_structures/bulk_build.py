@@ -0,0 +1,70 @@
+# tree_structures/bulk_build.py
+"""
+Sort and deduplicate a large batch of integer keys across worker processes.
+
+Tree nodes can't be shared between processes, and unpickling a finished
+subtree costs more than building it, so the workers do the O(n log n) part
+and send back sorted runs of keys packed into arrays. A balanced subtree is
+fully described by its sorted keys, so the runs are all the parent needs to
+build the tree in O(n).
+
+The keys are split into one chunk per worker; each worker sorts its chunk
+and cuts it at splitters sampled from the whole input, then a second round
+has worker j merge the j-th piece of every chunk. The merged runs cover
+consecutive key ranges, so they only need concatenating.
+"""
+import os
+import random
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this many keys, starting the workers costs more than they save
+PARALLEL_MIN_KEYS = 200_000
+# Sampled keys per worker when picking the splitters
+SAMPLES_PER_RUN = 64
+# Keys travel between processes as packed signed 64-bit integers
+TYPECODE = 'q'
+
+
+def _sort_and_cut(chunk: bytes, splitters) -> list:
+    keys = sorted(set(array(TYPECODE, chunk)))
+    bounds = [0] + [bisect_left(keys, splitter) for splitter in splitters] + [len(keys)]
+    return [array(TYPECODE, keys[lo:hi]).tobytes()
+            for lo, hi in zip(bounds, bounds[1:])]
+
+
+def _merge(pieces) -> bytes:
+    keys = array(TYPECODE)
+    for piece in pieces:
+        keys.frombytes(piece)
+    return array(TYPECODE, sorted(set(keys))).tobytes()
+
+
+def sorted_unique_keys(values, processes=None):
+    """
+    The distinct values in ascending order, as an indexable sequence.
+    
+    Args:
+        values: Iterable of integers that fit in 64 bits
+        processes: Worker processes to use; defaults to the CPU count. One
+                   process, or fewer than PARALLEL_MIN_KEYS values, sorts
+                   in this process.
+    """
+    keys = values if isinstance(values, list) else list(values)
+    processes = processes or os.cpu_count() or 1
+    if processes < 2 or len(keys) < PARALLEL_MIN_KEYS:
+        return sorted(set(keys))
+
+    sample = sorted(random.Random(len(keys)).sample(keys, processes * SAMPLES_PER_RUN))
+    splitters = sample[SAMPLES_PER_RUN::SAMPLES_PER_RUN]
+    size = -(-len(keys) // processes)
+    chunks = [array(TYPECODE, keys[start:start + size]).tobytes()
+              for start in range(0, len(keys), size)]
+
+    result = array(TYPECODE)
+    with ProcessPoolExecutor(processes) as pool:
+        pieces = list(pool.map(_sort_and_cut, chunks, [splitters] * len(chunks)))
+        for run in pool.map(_merge, zip(*pieces)):
+            result.frombytes(run)
+    return result
@@ -0,0 +1,214 @@
+# tree_structures/layout.py
+"""
+Linear-time tidy layout for binary trees (Reingold-Tilford).
+
+Every subtree is laid out once as a rigid shape: a parent places its two
+children as close together as their facing contours allow, then the whole
+tree is positioned in a single top-down pass. Contours are followed through
+children and, where a shallower subtree ends, through threads to the deeper
+sibling, which keeps the total work linear in the number of nodes.
+
+The per-node results are cached in `node.layout`. Mutations only have to
+reset that field to None on every node whose subtree changed (the path from
+the root down to the change), and `update()` then re-merges just those
+nodes and repositions just the subtrees that actually moved.
+"""
+from typing import List, Optional
+from .node import Node
+
+
+class LayoutInfo:
+    """Cached relative layout of the subtree rooted at one node."""
+    __slots__ = ('offset', 'depth', 'size', 'min_x', 'max_x',
+                 'leftmost', 'leftmost_x', 'rightmost', 'rightmost_x',
+                 'left_thread', 'left_thread_dx',
+                 'right_thread', 'right_thread_dx', 'generation')
+
+    def __init__(self, generation: int):
+        # x of this node relative to its parent
+        self.offset = 0.0
+        # Number of levels and nodes in the subtree
+        self.depth = 1
+        self.size = 1
+        # Horizontal extent of the subtree relative to this node
+        self.min_x = 0.0
+        self.max_x = 0.0
+        # Deepest left/right contour nodes and their x relative to this node
+        self.leftmost = None
+        self.leftmost_x = 0.0
+        self.rightmost = None
+        self.rightmost_x = 0.0
+        # Contour continuation for leaves, relative to this node
+        self.left_thread = None
+        self.left_thread_dx = 0.0
+        self.right_thread = None
+        self.right_thread_dx = 0.0
+        self.generation = generation
+
+
+class TidyTreeLayout:
+    def __init__(self, node_radius: float = 20, horizontal_spacing: float = 50,
+                 vertical_spacing: float = 70):
+        # Minimum distance between the centres of two nodes on one level
+        self.separation = node_radius * 2 + horizontal_spacing
+        self.vertical_spacing = vertical_spacing
+        self.generation = 0
+
+    def update(self, root: Optional[Node], full: bool = False) -> List[Node]:
+        """
+        Lay out the tree, reusing the cached layout of untouched subtrees.
+
+        Args:
+            root: Root of the tree to lay out
+            full: Ignore every cached subtree layout and start from scratch
+
+        Returns:
+            list: The nodes that were re-merged or changed position
+        """
+        if not root:
+            return []
+        self.generation += 1
+        generation = self.generation
+
+        # Collect the nodes that need merging in pre-order; parents come
+        # before their children so the reversed list is bottom-up.
+        order = []
+        if full or root.layout is None:
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                order.append(node)
+                if node.left and (full or node.left.layout is None):
+                    stack.append(node.left)
+                if node.right and (full or node.right.layout is None):
+                    stack.append(node.right)
+
+        for node in reversed(order):
+            self._merge(node, generation)
+
+        # Assign absolute positions top-down. A subtree that wasn't
+        # re-merged and whose root stays put keeps all of its positions.
+        changed = []
+        vertical_spacing = self.vertical_spacing
+        stack = [(root, 0.0, 0)]
+        while stack:
+            node, x, level = stack.pop()
+            y = level * vertical_spacing
+            if node.x != x or node.y != y:
+                node.x = x
+                node.y = y
+            elif node.layout.generation != generation:
+                continue
+            changed.append(node)
+            if node.left:
+                stack.append((node.left, x + node.left.layout.offset, level + 1))
+            if node.right:
+                stack.append((node.right, x + node.right.layout.offset, level + 1))
+        return changed
+
+    def extent(self, root: Optional[Node]):
+        """Bounding box (min_x, min_y, max_x, max_y) of the laid-out tree."""
+        if not root or root.layout is None:
+            return None
+        info = root.layout
+        return (root.x + info.min_x, root.y,
+                root.x + info.max_x,
+                root.y + (info.depth - 1) * self.vertical_spacing)
+
+    @staticmethod
+    def _next_left(node: Node):
+        if node.left:
+            return node.left, node.left.layout.offset
+        if node.right:
+            return node.right, node.right.layout.offset
+        return node.layout.left_thread, node.layout.left_thread_dx
+
+    @staticmethod
+    def _next_right(node: Node):
+        if node.right:
+            return node.right, node.right.layout.offset
+        if node.left:
+            return node.left, node.left.layout.offset
+        return node.layout.right_thread, node.layout.right_thread_dx
+
+    def _merge(self, node: Node, generation: int) -> None:
+        info = LayoutInfo(generation)
+        node.layout = info
+        left, right = node.left, node.right
+
+        if not left and not right:
+            info.leftmost = info.rightmost = node
+            return
+
+        if not left or not right:
+            # A single child still goes to its own side so the shape
+            # shows which branch it is on
+            child = left or right
+            child_info = child.layout
+            child_info.offset = (-self.separation if left else self.separation) / 2
+            self._take_extremes(info, child_info, child_info)
+            info.size = child_info.size + 1
+            return
+
+        left_info, right_info = left.layout, right.layout
+
+        # Walk the right contour of the left subtree and the left contour of
+        # the right subtree together, tracking the smallest gap that keeps
+        # them `separation` apart. Walking stops at the shallower depth, so
+        # threads hanging off the last level (which belong to an ancestor's
+        # context) are never followed.
+        separation = self.separation
+        shared_depth = min(left_info.depth, right_info.depth)
+        inner_left, inner_left_x = left, 0.0
+        inner_right, inner_right_x = right, 0.0
+        distance = separation
+        for _ in range(shared_depth - 1):
+            inner_left, dx = self._next_right(inner_left)
+            inner_left_x += dx
+            inner_right, dx = self._next_left(inner_right)
+            inner_right_x += dx
+            gap = inner_left_x - inner_right_x + separation
+            if gap > distance:
+                distance = gap
+
+        left_info.offset = -distance / 2
+        right_info.offset = distance / 2
+
+        # Thread the end of the shallower subtree's outer contour to the
+        # deeper subtree's contour one level further down
+        if left_info.depth < right_info.depth:
+            target, dx = self._next_left(inner_right)
+            holder = left_info.leftmost.layout
+            holder.left_thread = target
+            holder.left_thread_dx = ((right_info.offset + inner_right_x + dx)
+                                     - (left_info.offset + left_info.leftmost_x))
+        elif right_info.depth < left_info.depth:
+            target, dx = self._next_right(inner_left)
+            holder = right_info.rightmost.layout
+            holder.right_thread = target
+            holder.right_thread_dx = ((left_info.offset + inner_left_x + dx)
+                                      - (right_info.offset + right_info.rightmost_x))
+
+        self._take_extremes(
+            info,
+            left_info if left_info.depth >= right_info.depth else right_info,
+            right_info if right_info.depth >= left_info.depth else left_info)
+        info.min_x = min(info.min_x, left_info.offset + left_info.min_x,
+                         right_info.offset + right_info.min_x)
+        info.max_x = max(info.max_x, left_info.offset + left_info.max_x,
+                         right_info.offset + right_info.max_x)
+        info.size = left_info.size + right_info.size + 1
+
+    @staticmethod
+    def _take_extremes(info: LayoutInfo, outer_left: LayoutInfo,
+                       outer_right: LayoutInfo) -> None:
+        """Inherit the deepest contour nodes from the deeper child subtrees."""
+        info.depth = max(outer_left.depth, outer_right.depth) + 1
+        info.leftmost = outer_left.leftmost
+        info.leftmost_x = outer_left.offset + outer_left.leftmost_x
+        info.rightmost = outer_right.rightmost
+        info.rightmost_x = outer_right.offset + outer_right.rightmost_x
+        info.min_x = min(0.0, outer_left.offset + outer_left.min_x,
+                         outer_right.offset + outer_right.min_x)
+        info.max_x = max(0.0, outer_left.offset + outer_left.max_x,
+                         outer_right.offset + outer_right.max_x)
@@ -1,12 +1,27 @@
 # tree_structures/node.py
-from dataclasses import dataclass
 from typing import Optional
 
-@dataclass
 class Node:
-    value: int
-    x: float = 0
-    y: float = 0
-    height: int = 1
-    left: Optional['Node'] = None
-    right: Optional['Node'] = None
\ No newline at end of file
+    # Nodes compare and hash by identity: structural equality would
+    # recurse through both subtrees, and two distinct nodes are never
+    # interchangeable anyway.
+    __slots__ = ('value', 'x', 'y', 'height', 'size', 'left', 'right', 'layout')
+
+    def __init__(self, value: int, x: float = 0, y: float = 0, height: int = 1,
+                 left: Optional['Node'] = None, right: Optional['Node'] = None,
+                 size: int = 1):
+        self.value = value
+        self.x = x
+        self.y = y
+        self.height = height
+        # Number of nodes in this subtree, kept by trees with order statistics
+        self.size = size
+        self.left = left
+        self.right = right
+        # Cached subtree layout, reset to None whenever the subtree changes
+        self.layout = None
+
+    def __repr__(self):
+        return (f"Node(value={self.value!r}, x={self.x!r}, y={self.y!r}, "
+                f"height={self.height!r}, size={self.size!r}, "
+                f"left={self.left!r}, right={self.right!r})")
@@ -0,0 +1,264 @@
+# tree_structures/persistent_avl.py
+from typing import List, Optional
+from .avl import AVLTree
+from .node import Node
+
+
+class PersistentAVLTree(AVLTree):
+    """
+    AVL tree that keeps every earlier version of itself.
+
+    insert() and delete() never change a node that is already part of a
+    version. They copy the nodes on the path they walk (plus the sibling a
+    delete has to rotate), so each operation adds O(log n) nodes and a new
+    root to `versions` while sharing everything else with the previous
+    version. `root` is the version being shown; checkout() switches it in
+    O(1) plus one relayout.
+
+    Operations apply to the version being shown, and the result is always
+    appended as the newest version, so editing an old version branches the
+    history instead of discarding what came after it.
+    
+    union(), intersection() and difference() path-copy one key at a time
+    and add a single version, so they cost O(m log n) rather than the
+    split-based bound of AVLTree. join() and split() raise TypeError: they
+    hand the nodes of their inputs over to new trees, which would take
+    them away from the versions that still share them.
+    """
+    def __init__(self, instrumentation: str = 'full', order_statistics: bool = True):
+        super().__init__(instrumentation, order_statistics)
+        # Root of every version, oldest first; version 0 is the empty tree
+        self.versions: List[Optional[Node]] = [None]
+        self.version = 0
+        # Set by checkout(): the next layout pass has to start from scratch
+        self._relayout = False
+
+    def insert(self, value: int) -> bool:
+        if not super().insert(value):
+            return False
+        self._commit_version()
+        return True
+
+    def delete(self, value: int) -> bool:
+        if not super().delete(value):
+            return False
+        self._commit_version()
+        return True
+
+    def insert_many(self, values) -> int:
+        inserted = super().insert_many(values)
+        if inserted:
+            self._commit_version()
+        return inserted
+
+    def bulk_load(self, values, processes=None) -> int:
+        loaded = super().bulk_load(values, processes)
+        self._commit_version()
+        return loaded
+
+    def checkout(self, version: int) -> None:
+        """
+        Show an earlier or later version.
+
+        Switching is O(1), but nodes shared between versions keep the layout
+        of whichever version was shown last, so the next layout pass redoes
+        the whole tree.
+
+        Raises:
+            IndexError: version does not exist
+        """
+        root = self.versions[version]
+        if self.track_changes and self.root:
+            kept = set(self._nodes(root))
+            for node in self._nodes(self.root):
+                if node not in kept:
+                    self._record_removed(node)
+        self.root = root
+        self.version = version
+        self._relayout = True
+        self._update_positions()
+
+    def copy(self, layout: bool = True):
+        """Copy of the version being shown, without the history."""
+        clone = super().copy(layout)
+        clone.versions = [clone.root]
+        return clone
+
+    def _update_positions(self):
+        if self._relayout and not self._batch_depth:
+            self._relayout = False
+            self._invalidate_layout(self._nodes(self.root))
+        super()._update_positions()
+
+    def _commit_version(self) -> None:
+        self.versions.append(self.root)
+        self.version = len(self.versions) - 1
+
+    def _nodes(self, root: Optional[Node]):
+        stack = [root] if root else []
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.left:
+                stack.append(node.left)
+            if node.right:
+                stack.append(node.right)
+
+    def _copy(self, node: Node) -> Node:
+        """Writable copy of a node that belongs to an existing version."""
+        copy = Node(node.value, height=node.height, left=node.left,
+                    right=node.right, size=node.size)
+        self._record_removed(node)
+        return copy
+
+    def _copy_path(self, path: List[Node]) -> List[Node]:
+        """Copy a root-to-node path and link the copies as the new root."""
+        copies = [self._copy(node) for node in path]
+        for i in range(1, len(copies)):
+            if path[i - 1].left is path[i]:
+                copies[i - 1].left = copies[i]
+            else:
+                copies[i - 1].right = copies[i]
+        self.root = copies[0]
+        return copies
+
+    def _insert_iterative(self, value: int) -> bool:
+        if not self.root:
+            self.root = Node(value)
+            return True
+
+        span = self.metrics.start_span()
+        path = []
+        node = self.root
+        while node:
+            if value == node.value:
+                # A rejected call is not an operation, so its comparisons
+                # aren't counted either
+                self.metrics.end_span('descent', span)
+                return False
+            path.append(node)
+            node = node.left if value < node.value else node.right
+        self.metrics.increment_comparisons(len(path))
+
+        # Insert rotations only involve nodes on the path, so copying the
+        # path is enough for the rebalance too
+        path = self._copy_path(path)
+        parent = path[-1]
+        if value < parent.value:
+            parent.left = Node(value)
+        else:
+            parent.right = Node(value)
+        if self.order_statistics:
+            for node in path:
+                node.size += 1
+        self.metrics.end_span('descent', span)
+
+        span = self.metrics.start_span()
+        self._retrace(path, lambda n: self._rebalance_insert(n, value))
+        self.metrics.end_span('rebalance', span)
+        return True
+
+    def _delete_iterative(self, value: int) -> bool:
+        span = self.metrics.start_span()
+        path = []
+        node = self.root
+        while node:
+            path.append(node)
+            if value == node.value:
+                break
+            node = node.left if value < node.value else node.right
+
+        if not node:
+            # Nothing to delete; like a duplicate insert, not counted
+            self.metrics.end_span('descent', span)
+            return False
+        comparisons = len(path)
+
+        target = len(path) - 1
+        two_children = node.left and node.right
+        if two_children:
+            # Extend the path to the in-order successor, which is unlinked
+            # in place of the node holding the value
+            successor = node.right
+            steps = 0
+            while successor:
+                path.append(successor)
+                successor = successor.left
+                steps += 1
+            comparisons += 2 * (steps - 1) + 1
+        self.metrics.increment_comparisons(comparisons)
+
+        path = self._copy_path(path)
+        unlinked = path.pop()
+        if two_children:
+            path[target].value = unlinked.value
+            child = unlinked.right
+        else:
+            child = unlinked.left if unlinked.left else unlinked.right
+
+        if not path:
+            self.root = child
+        elif path[-1].left is unlinked:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        if self.order_statistics:
+            for ancestor in path:
+                ancestor.size -= 1
+        self.metrics.end_span('descent', span)
+
+        span = self.metrics.start_span()
+        self._retrace(path, self._rebalance)
+        self.metrics.end_span('rebalance', span)
+        return True
+
+    def _rebalance(self, node: Node) -> Node:
+        # Rotating after a delete also moves nodes off the path (the taller
+        # sibling and possibly its inner child); copy those first
+        self._update_height(node)
+        balance = self._get_balance(node)
+        if balance > 1:
+            node.left = heavy = self._copy(node.left)
+            if self._get_balance(heavy) < 0:
+                heavy.right = self._copy(heavy.right)
+        elif balance < -1:
+            node.right = heavy = self._copy(node.right)
+            if self._get_balance(heavy) > 0:
+                heavy.left = self._copy(heavy.left)
+        return super()._rebalance(node)
+
+    @classmethod
+    def join(cls, left, key, right):
+        raise TypeError("PersistentAVLTree doesn't support join(): it would move "
+                        "nodes shared with earlier versions; use insert()")
+
+    def split(self, key):
+        raise TypeError("PersistentAVLTree doesn't support split(): it would move "
+                        "nodes shared with earlier versions")
+
+    def union(self, other) -> None:
+        """Add every key of `other` as one new version."""
+        self._per_key_version('union', self._insert_iterative, list(other.values()))
+
+    def intersection(self, other) -> None:
+        """Keep only the keys that are also in `other`, as one new version."""
+        self._per_key_version('intersection', self._delete_iterative,
+                              [key for key in self.values() if not other.contains(key)])
+
+    def difference(self, other) -> None:
+        """Remove every key that is in `other`, as one new version."""
+        self._per_key_version('difference', self._delete_iterative,
+                              list(other.values()))
+
+    def _per_key_version(self, operation: str, apply, keys) -> None:
+        """Path-copying insert or delete of every key, committed as one version."""
+        start_time = self.metrics.start_operation()
+        try:
+            changed = 0
+            for key in keys:
+                changed += apply(key)
+            if changed:
+                self._commit_version()
+                self._update_positions()
+        finally:
+            self.metrics.end_operation(operation, start_time)
@@ -0,0 +1,198 @@
+# tree_structures/snapshot.py
+"""
+Binary snapshots of trees that load in O(n) without a single comparison.
+
+A snapshot file holds one or more trees. Each tree is stored as flat
+arrays in preorder: the keys (int64), a shape byte per node telling whether
+it has a left and/or a right child, the node heights and the subtree sizes
+(both uint32, so a degenerate BST keeps its full height).
+Preorder plus the shape bytes pin down the exact tree, so loading just
+links the nodes up in file order; no key is compared, nothing is rebalanced
+and no per-node field has to be recomputed.
+
+The file is memory-mapped on load and the keys are read in place.
+
+    header   b'TREESNP2', tree count (uint32)
+    per tree kind (uint8: 0 BST, 1 AVL), node count (uint64),
+             keys, shape bytes, heights (uint32), sizes (uint32)
+"""
+import gc
+import mmap
+import struct
+import sys
+from array import array
+from typing import List
+
+from .avl import AVLTree
+from .bst import BST
+from .node import Node
+
+MAGIC = b'TREESNP2'
+_FILE_HEADER = struct.Struct('<8sI')
+_TREE_HEADER = struct.Struct('<BQ')
+# Bytes per node: key, shape, height, size
+NODE_BYTES = 8 + 1 + 4 + 4
+# Heights and sizes are uint32, which bounds the nodes per tree
+MAX_NODES = 2 ** 32 - 1
+KINDS = (BST, AVLTree)
+
+HAS_LEFT = 1
+HAS_RIGHT = 2
+
+
+def save_snapshot(path, *trees) -> None:
+    """
+    Write the trees (BST or AVLTree instances) to one snapshot file.
+    
+    Raises:
+        ValueError: A tree has more than MAX_NODES nodes
+    """
+    with open(path, 'wb') as out:
+        out.write(_FILE_HEADER.pack(MAGIC, len(trees)))
+        for tree in trees:
+            kind = 1 if isinstance(tree, AVLTree) else 0
+            keys, shape, heights = array('q'), array('B'), array('I')
+            nodes = []
+            stack = [tree.root] if tree.root else []
+            while stack:
+                node = stack.pop()
+                nodes.append(node)
+                keys.append(node.value)
+                shape.append((HAS_LEFT if node.left else 0)
+                             | (HAS_RIGHT if node.right else 0))
+                heights.append(node.height)
+                if node.right:
+                    stack.append(node.right)
+                if node.left:
+                    stack.append(node.left)
+            if len(keys) > MAX_NODES:
+                raise ValueError(f"can't save a tree of more than {MAX_NODES} nodes")
+            sizes = array('I', _subtree_sizes(tree, nodes))
+            if sys.byteorder == 'big':
+                keys.byteswap()
+                heights.byteswap()
+                sizes.byteswap()
+            out.write(_TREE_HEADER.pack(kind, len(keys)))
+            keys.tofile(out)
+            shape.tofile(out)
+            heights.tofile(out)
+            sizes.tofile(out)
+
+
+def load_snapshot(path, instrumentation: str = 'full', layout: bool = True) -> list:
+    """
+    Every tree in a snapshot file, laid out and ready to draw.
+    
+    The layout pass costs far more than reading the file (several times
+    as much for a large tree). With layout False the trees are left
+    unlaid out until their first layout pass.
+
+    Raises:
+        ValueError: The file is not a snapshot or is damaged
+    """
+    trees = []
+    for tree_class, root, _ in read_snapshot(path):
+        tree = tree_class(instrumentation)
+        tree.root = root
+        if layout:
+            tree._update_positions()
+        trees.append(tree)
+    return trees
+
+
+def read_snapshot(path) -> List[tuple]:
+    """
+    (tree class, root, node count) for every tree in a snapshot file,
+    without laying the trees out.
+
+    Raises:
+        ValueError: The file is not a snapshot or is damaged
+    """
+    with open(path, 'rb') as source, \
+            mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if len(data) < _FILE_HEADER.size:
+            raise ValueError(f"{path} is not a tree snapshot")
+        magic, tree_count = _FILE_HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a tree snapshot")
+
+        trees = []
+        offset = _FILE_HEADER.size
+        for _ in range(tree_count):
+            if offset + _TREE_HEADER.size > len(data):
+                raise ValueError(f"{path} is truncated")
+            kind, count = _TREE_HEADER.unpack_from(data, offset)
+            offset += _TREE_HEADER.size
+            end = offset + count * NODE_BYTES
+            if kind >= len(KINDS) or end > len(data):
+                raise ValueError(f"{path} is damaged or truncated")
+            shape_at = offset + count * 8
+            heights_at = shape_at + count
+            sizes_at = heights_at + count * 4
+            with memoryview(data) as view:
+                shape = bytes(view[shape_at:heights_at])
+                if sys.byteorder == 'big':
+                    keys, heights, sizes = array('q'), array('I'), array('I')
+                    keys.frombytes(view[offset:shape_at])
+                    heights.frombytes(view[heights_at:sizes_at])
+                    sizes.frombytes(view[sizes_at:end])
+                    keys.byteswap()
+                    heights.byteswap()
+                    sizes.byteswap()
+                    root = _link(keys, shape, heights, sizes)
+                else:
+                    # Keys, heights and sizes are read straight out of the
+                    # mapped file
+                    with view[offset:shape_at].cast('q') as keys, \
+                            view[heights_at:sizes_at].cast('I') as heights, \
+                            view[sizes_at:end].cast('I') as sizes:
+                        root = _link(keys, shape, heights, sizes)
+            trees.append((KINDS[kind], root, count))
+            offset = end
+        return trees
+
+
+def _subtree_sizes(tree, nodes):
+    """Subtree sizes of `nodes` (in preorder), recomputed if the tree doesn't keep them."""
+    if tree.order_statistics:
+        return [node.size for node in nodes]
+    sizes = {}
+    for node in reversed(nodes):
+        sizes[node] = sizes.get(node.left, 0) + sizes.get(node.right, 0) + 1
+    return [sizes[node] for node in nodes]
+
+
+def _link(keys, shape: bytes, heights, sizes):
+    """Link up the nodes of one tree from its preorder arrays."""
+    count = len(shape)
+    if not count:
+        return None
+    # The nodes form no reference cycles, so the collector has nothing to
+    # find while a large tree is being created
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        root = Node(keys[0], 0, 0, heights[0], None, None, sizes[0])
+        # Nodes still waiting for their right child, deepest last
+        waiting = []
+        wait, resume = waiting.append, waiting.pop
+        parent = root
+        flags = shape[0]
+        for key, height, size, next_flags in zip(keys[1:], heights[1:],
+                                                 sizes[1:], shape[1:]):
+            node = Node(key, 0, 0, height, None, None, size)
+            if flags & HAS_RIGHT:
+                wait(parent)
+            if flags & HAS_LEFT:
+                parent.left = node
+            else:
+                resume().right = node
+            parent, flags = node, next_flags
+        if waiting or flags:
+            raise IndexError
+    except IndexError:
+        raise ValueError("snapshot tree shape is inconsistent") from None
+    finally:
+        if collecting:
+            gc.enable()
+    return root